@@ -3,30 +3,47 @@
 import os
 import re
 from datetime import datetime
-import pandas as pd
 import sys
-from skyepipeline_files.MasterLogCreation import build_master_log
-from skyepipeline_files.WeeklySummaryCreator import build_weekly_summary, get_float_input, get_int_input
-from skyepipeline_files.BuildWeeklyWorkbook import build_weekly_workbook
+
+# 3PL filenames carry the period like: '... 11.17.25 to 11.23.25.xlsx'
+DATE_RANGE_RE = re.compile(r"(\d{1,2}\.\d{1,2}\.\d{2})\s*to\s*(\d{1,2}\.\d{1,2}\.\d{2})", re.IGNORECASE)
 
 # --- File picker helpers ---
+# One hidden Tk root shared by every dialog (created on first use)
+_tk_root = None
+
+def _get_tk_root():
+    global _tk_root
+    if _tk_root is None:
+        import tkinter as tk
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+    return _tk_root
+
+def _close_tk_root():
+    global _tk_root
+    if _tk_root is not None:
+        _tk_root.destroy()
+        _tk_root = None
+
 def pick_file(title="Select file", filetypes=(('All files', '*.*'),)):
-    import tkinter as tk
     from tkinter import filedialog
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title=title, filetypes=filetypes)
-    root.destroy()
-    return file_path
+    return filedialog.askopenfilename(parent=_get_tk_root(), title=title, filetypes=filetypes)
 
 def pick_directory(title="Select output folder"):
-    import tkinter as tk
     from tkinter import filedialog
-    root = tk.Tk()
-    root.withdraw()
-    dir_path = filedialog.askdirectory(title=title)
-    root.destroy()
-    return dir_path
+    return filedialog.askdirectory(parent=_get_tk_root(), title=title)
+
+
+def infer_date_range_from_filename(fname: str):
+    m = DATE_RANGE_RE.search(fname)
+    if not m:
+        return None, None
+    try:
+        return (datetime.strptime(m.group(1), "%m.%d.%y"),
+                datetime.strptime(m.group(2), "%m.%d.%y"))
+    except ValueError:
+        return None, None
 
 
 def get_period_inputs_ui(defaults=None):
@@ -36,43 +53,43 @@ def get_period_inputs_ui(defaults=None):
     result = {}
     cancelled = {"flag": False}
 
-    root = tk.Tk()
-    root.title("Period Inputs")
+    win = tk.Toplevel(_get_tk_root())
+    win.title("Period Inputs")
 
-    tk.Label(root, text="Starting inventory (bars):").grid(row=0, column=0, sticky="e", padx=6, pady=6)
+    tk.Label(win, text="Starting inventory (bars):").grid(row=0, column=0, sticky="e", padx=6, pady=6)
     start_var = tk.StringVar(value=str(defaults.get("starting_inventory", "")))
-    tk.Entry(root, textvariable=start_var).grid(row=0, column=1, padx=6, pady=6)
+    tk.Entry(win, textvariable=start_var).grid(row=0, column=1, padx=6, pady=6)
 
-    tk.Label(root, text="Payment processing fee ($):").grid(row=1, column=0, sticky="e", padx=6, pady=6)
+    tk.Label(win, text="Payment processing fee ($):").grid(row=1, column=0, sticky="e", padx=6, pady=6)
     fee_var = tk.StringVar(value=str(defaults.get("payment_processing_fee", "")))
-    tk.Entry(root, textvariable=fee_var).grid(row=1, column=1, padx=6, pady=6)
+    tk.Entry(win, textvariable=fee_var).grid(row=1, column=1, padx=6, pady=6)
     
-    tk.Label(root, text="Total POS Bars given to sales members:").grid(row=2, column=0, sticky="e", padx=6, pady=6)
+    tk.Label(win, text="Total POS Bars given to sales members:").grid(row=2, column=0, sticky="e", padx=6, pady=6)
     tot_pos_var = tk.StringVar(value=str(defaults.get("tot_pos_bars", "")))
-    tk.Entry(root, textvariable=tot_pos_var).grid(row=2, column=1, padx=6, pady=6)
+    tk.Entry(win, textvariable=tot_pos_var).grid(row=2, column=1, padx=6, pady=6)
 
-    tk.Label(root, text="Bars to be sold (POS):").grid(row=3, column=0, sticky="e", padx=6, pady=6)
+    tk.Label(win, text="Bars to be sold (POS):").grid(row=3, column=0, sticky="e", padx=6, pady=6)
     pos_var = tk.StringVar(value=str(defaults.get("pos_bars", "")))
-    tk.Entry(root, textvariable=pos_var).grid(row=3, column=1, padx=6, pady=6)
+    tk.Entry(win, textvariable=pos_var).grid(row=3, column=1, padx=6, pady=6)
 
     def on_ok():
         result["starting_inventory"] = start_var.get().strip()
         result["payment_processing_fee"] = fee_var.get().strip()
         result["tot_pos_bars"] = tot_pos_var.get().strip()
         result["pos_bars"] = pos_var.get().strip()
-        root.destroy()
+        win.destroy()
 
     def on_cancel():
         # mark cancellation so caller can exit cleanly
         result.clear()
         cancelled["flag"] = True
-        root.destroy()
+        win.destroy()
 
-    tk.Button(root, text="OK", command=on_ok).grid(row=4, column=0, pady=8)
-    tk.Button(root, text="Cancel", command=on_cancel).grid(row=4, column=1, pady=8)
+    tk.Button(win, text="OK", command=on_ok).grid(row=4, column=0, pady=8)
+    tk.Button(win, text="Cancel", command=on_cancel).grid(row=4, column=1, pady=8)
 
-    root.resizable(False, False)
-    root.mainloop()
+    win.resizable(False, False)
+    win.wait_window()
 
     # If the user cancelled/closed the window, return None so caller can exit
     if cancelled["flag"]:
@@ -123,7 +140,14 @@ Notes:
      imported and tested independently.
 """
 
-def main():
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the Skye period report.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse the inputs fresh and don't keep a parsed copy, even when "
+                             "SKYE_CACHE_DIR names a cache folder")
+    args = parser.parse_args(argv)
+
     print("=== Skye Period Report Pipeline ===")
 
 
@@ -144,38 +168,39 @@ def main():
         print(f"3PL file not found: {threepl_file}")
         sys.exit(1)
 
-    
-    # Try to infer start/end from filename like: '... 11.17.25 to 11.23.25.xlsx'
-    def _infer_date_range_from_filename(fname: str):
-        m = re.search(r"(\d{1,2}\.\d{1,2}\.\d{2})\s*to\s*(\d{1,2}\.\d{1,2}\.\d{2})", fname, re.IGNORECASE)
-        if not m:
-            return None, None
+    # pandas and the pipeline modules (openpyxl etc.) are imported only once
+    # both inputs are picked, so cancelling a dialog exits without paying for them
+    import pandas as pd
+    from skyepipeline_files.MasterLogCreation import build_master_log
+    from skyepipeline_files.WeeklySummaryCreator import build_weekly_summary, get_float_input, get_int_input
+    from skyepipeline_files.BuildWeeklyWorkbook import build_weekly_workbook
+    from skyepipeline_files import SkyeHelpers
+    from skyepipeline_files.SkyeHelpers import read_threepl_excel
+    if args.no_cache:
+        # The parsed Shopify export holds customer names and emails
+        SkyeHelpers.CACHE_DIR = None
+
+    # Parse the 3PL workbook once; the frame is shared by every step below
+    threepl_df = read_threepl_excel(threepl_file)
 
-        def _parse_mmddyy(s: str):
-            month, day, yy = s.split('.')
-            year = 2000 + int(yy)
-            return datetime(year=int(year), month=int(month), day=int(day))
-
-        try:
-            return _parse_mmddyy(m.group(1)), _parse_mmddyy(m.group(2))
-        except Exception:
-            return None, None
-
-    start_date, end_date = _infer_date_range_from_filename(threepl_file)
+    # Try to infer start/end from filename like: '... 11.17.25 to 11.23.25.xlsx'
+    start_date, end_date = infer_date_range_from_filename(threepl_file)
 
-    # Fallback: read the 3PL excel and search for any column containing 'date'
+    # Fallback: search the 3PL sheet for any column containing 'date'
     if start_date is None:
         try:
-            df_3pl = pd.read_excel(threepl_file)
-            date_cols = [c for c in df_3pl.columns if 'date' in str(c).lower()]
+            names = threepl_df.columns.astype(str).str.lower()
+            date_cols = threepl_df.columns[names.str.contains('date', regex=False)].tolist()
             if date_cols:
-                dates = []
-                for c in date_cols:
-                    parsed = pd.to_datetime(df_3pl[c], errors='coerce')
-                    dates.extend(parsed.dropna().tolist())
-                if dates:
-                    start_date = min(dates)
-                    end_date = max(dates)
+                # Parse each column (per-column format inference), then take
+                # the overall range with vectorized min/max
+                dates = pd.concat(
+                    [pd.to_datetime(threepl_df[c], errors='coerce') for c in date_cols],
+                    ignore_index=True,
+                ).dropna()
+                if not dates.empty:
+                    start_date = dates.min()
+                    end_date = dates.max()
         except Exception:
             start_date = None
 
@@ -198,6 +223,8 @@ def main():
 
     # ---- financial inputs (small UI) ----
     ui_vals = get_period_inputs_ui()
+    # All dialogs are done; release the shared Tk root
+    _close_tk_root()
     if ui_vals is None:
         print("Period inputs dialog was cancelled. Exiting.")
         sys.exit(0)
@@ -221,13 +248,13 @@ def main():
 
     # ---- STEP 1: build master log (returns DataFrame) ----
     print("\n[1/3] Building master log (in-memory)...")
-    master_df = build_master_log(orders_file, threepl_file, output_path=None)
+    master_df = build_master_log(orders_file, threepl_df, output_path=None)
 
     # ---- STEP 2: build weekly summary (returns DataFrame) ----
     print("\n[2/3] Building weekly summary (in-memory)...")
     summary_df = build_weekly_summary(
         master_df,
-        threepl_file,
+        threepl_df,
         output_path=None,
         payment_processing_fee=payment_processing_fee,
         starting_inventory=starting_inventory,
@@ -9,25 +9,52 @@
 
 import pandas as pd
 import numpy as np
+from openpyxl.styles import NamedStyle
+from openpyxl.utils import get_column_letter
 import re
-from skyepipeline_files.MasterLogCreation import build_master_log
-from skyepipeline_files.WeeklySummaryCreator import build_weekly_summary
-from skyepipeline_files.BuildWeeklyWorkbook import build_weekly_workbook
+import json
+import difflib
+from skyepipeline_files.BuildWeeklyWorkbook import column_widths, escape_excel_formulas
+from skyepipeline_files.SkyeHelpers import cache_file, prune_cache
 import os
+from functools import lru_cache
 from datetime import datetime
 import sys
 from pathlib import Path
-import tkinter as tk 
-from tkinter import filedialog
+
+# Period token in a report's sheet name or filename, e.g. '2025-11-17_to_2025-11-23'
+_DATE_RANGE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\s*_?to\s*_?(\d{4}-\d{2}-\d{2})", re.IGNORECASE)
+# Leading '+'/'-' on Financial Summary metric labels (e.g. '- COGS')
+_LEADSIGN_RE = re.compile(r"^[\+\-]\s*")
+# Words of a (lower-cased) metric label or lookup keyword
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# One hidden Tk root shared by both pickers (created on first use, so
+# tkinter is only imported when a dialog is actually shown)
+_tk_root = None
+
+
+def _get_tk_root():
+	global _tk_root
+	if _tk_root is None:
+		import tkinter as tk
+		_tk_root = tk.Tk()
+		_tk_root.withdraw()
+	return _tk_root
+
+
+def _close_tk_root():
+	global _tk_root
+	if _tk_root is not None:
+		_tk_root.destroy()
+		_tk_root = None
 
 
 def pick_report_files(title="Select period report files", filetypes=(('Excel files', ('*.xlsx', '*.xls')), ('All files', '*.*'))):
 	"""Open a file picker allowing multiple selection and return list of paths or None if cancelled."""
-
-	root = tk.Tk()
-	root.withdraw()
-	files = filedialog.askopenfilenames(title=title, filetypes=filetypes)
-	root.destroy()
+	from tkinter import filedialog
+	files = filedialog.askopenfilenames(parent=_get_tk_root(), title=title, filetypes=filetypes)
 	if not files:
 		return None
 	return list(files)
@@ -35,27 +62,442 @@ def pick_report_files(title="Select period report files", filetypes=(('Excel fil
 
 def pick_output_directory(title="Select output folder for combined report"):
 	"""Open a directory picker and return the selected path or None if cancelled."""
-	root = tk.Tk()
-	root.withdraw()
-	
+	from tkinter import filedialog
 	# Default to Desktop
 	desktop = Path.home() / "Desktop"
 	initial_dir = str(desktop) if desktop.exists() else str(Path.home())
 	
-	dir_path = filedialog.askdirectory(title=title, initialdir=initial_dir)
-	root.destroy()
+	dir_path = filedialog.askdirectory(parent=_get_tk_root(), title=title, initialdir=initial_dir)
 	if not dir_path:
 		return None
 	return dir_path
 
 
+def _open_report(path):
+	"""pd.ExcelFile for a period report. Prefers the Rust-backed `calamine`
+	engine (pip install python-calamine) and falls back to openpyxl
+	(read-only, values-only) when it is not available."""
+	try:
+		return pd.ExcelFile(path, engine="calamine")
+	except ImportError:
+		return pd.ExcelFile(path, engine="openpyxl")
+
+
+def _calamine_cell(v):
+	"""Match openpyxl's values: blank cells are None, whole numbers are ints."""
+	if v == "":
+		return None
+	if isinstance(v, float) and v.is_integer():
+		return int(v)
+	return v
+
+
+def _iter_sheet_rows(xls, sheet_name, max_row=None, max_col=None):
+	"""Value tuples for the rows of a sheet of an open ExcelFile (either
+	engine), blank cells as None. Rows are padded/cut to `max_col` cells."""
+	if xls.engine == "calamine":
+		sheet = xls.book.get_sheet_by_name(sheet_name)
+		rows = (tuple(map(_calamine_cell, r)) for r in sheet.to_python(skip_empty_area=False, nrows=max_row))
+		if max_col is not None:
+			rows = (r[:max_col] + (None,) * (max_col - len(r)) for r in rows)
+		return rows
+	return xls.book[sheet_name].iter_rows(max_row=max_row, max_col=max_col, values_only=True)
+
+
+def _read_sheet_rows(xls, sheet_name, ncols=None):
+	"""Return (header, rows) for a sheet of an open ExcelFile.
+
+	Follows pd.read_excel's defaults: the first row is the header (blank
+	headers become 'Unnamed: <i>') and trailing blank rows are dropped.
+	`ncols` is called with the header and returns how many leading columns
+	of the data rows to read (default: all).
+	"""
+	first = next(iter(_iter_sheet_rows(xls, sheet_name, max_row=1)), ())
+	header = [f"Unnamed: {i}" if h is None else str(h).strip() for i, h in enumerate(first)]
+	max_col = ncols(header) if ncols is not None else None
+	rows = list(_iter_sheet_rows(xls, sheet_name, max_col=max_col))[1:]
+	while rows and all(v is None for v in rows[-1]):
+		rows.pop()
+	return header, rows
+
+
+def _metric_value_cols(header):
+	"""Positions of a summary sheet's Metric and Value columns (Value may be None)."""
+	metric_col = None
+	value_col = None
+	for i, c in enumerate(header):
+		cl = c.lower()
+		if 'metric' in cl:
+			metric_col = i
+		if 'value' in cl:
+			value_col = i
+	# fallback heuristics
+	if metric_col is None:
+		metric_col = 0
+	if value_col is None and len(header) > 1:
+		value_col = 1
+	return metric_col, value_col
+
+
+def _summary_ncols(header):
+	"""Leading summary columns any combiner reads: the first two (inventory/POS)
+	and the Metric/Value columns (financials). Note-style columns are skipped."""
+	metric_col, value_col = _metric_value_cols(header)
+	return max(2, metric_col + 1, (value_col or 0) + 1)
+
+
+def _parse_num(v, percent=False):
+	"""Parse one Value cell to a float.
+
+	Numbers pass straight through. Text has '$', ',' and non-breaking spaces
+	removed and '(123)' reads as -123; with `percent`, '12%' reads as 0.12.
+	Anything else (blank, unparseable, dates) is NaN.
+	"""
+	if isinstance(v, (int, float, np.number)):
+		return float(v)
+	if not isinstance(v, str):
+		return np.nan
+	return _parse_num_text(v, percent)
+
+
+# Value text repeats a lot across reports (blanks, separators, round amounts)
+@lru_cache(maxsize=4096)
+def _parse_num_text(v, percent):
+	s = v.strip()
+	# parentheses for negatives
+	neg = s.startswith('(') and s.endswith(')')
+	if neg:
+		s = s.strip('()')
+	s = s.replace('$', '').replace(',', '').replace('\xa0', '').strip()
+	try:
+		if percent and s.endswith('%'):
+			x = float(s.strip('%')) / 100.0
+		else:
+			x = float(s)
+	except ValueError:
+		return np.nan
+	return -x if neg else x
+
+
+def _metric_mapping(rows, metric_col, value_col, percent=False):
+	"""Map each summary row's cleaned metric label (lower-case, no leading
+	'+'/'-') to its parsed value, in one pass over the row tuples. Rows with
+	no metric are skipped; later duplicates win."""
+	mapping = {}
+	for r in rows:
+		m = r[metric_col] if metric_col < len(r) else None
+		if m is None:
+			continue
+		v = r[value_col] if value_col is not None and value_col < len(r) else None
+		mapping[_LEADSIGN_RE.sub("", str(m).strip()).strip().lower()] = _parse_num(v, percent)
+	return mapping
+
+
+def _find_master_sheet(sheet_names):
+	# Accept names that equal 'master log' or contain both 'master' and 'log'.
+	for s in sheet_names:
+		s_norm = str(s).strip().lower()
+		if s_norm == "master log" or ("master" in s_norm and "log" in s_norm):
+			return s
+	return None
+
+
+def _find_summary_sheet(sheet_names):
+	for s in sheet_names:
+		s_norm = str(s).strip().lower()
+		if s_norm == "financial summary" or ("financial" in s_norm and "summary" in s_norm):
+			return s
+	return None
+
+
+def _scan_for_summary_sheet(xls):
+	"""Fallback: find a sheet with a 'Metric' column or 'Gross Revenue' text.
+
+	Only peeks at each sheet's header row and the first column of the next
+	50 rows of the open ExcelFile `xls`. Sheets are probed closest name to
+	'financial summary' first (e.g. 'Fin Summ', 'Financials'), so a renamed
+	summary sheet is usually the only one parsed.
+	"""
+	for s in _by_summary_likeness(xls.sheet_names):
+		try:
+			rows = list(_iter_sheet_rows(xls, s, max_row=51))
+			if not rows:
+				continue
+			# check for Metric column
+			if any('metric' in str(h).lower() for h in rows[0] if h is not None):
+				return s
+			# or check first column for 'gross revenue'
+			for row in rows[1:]:
+				if row and row[0] is not None and 'gross revenue' in str(row[0]).lower():
+					return s
+		except Exception:
+			continue
+	return None
+
+
+def _by_summary_likeness(sheet_names):
+	"""`sheet_names` ordered by name similarity to 'financial summary', most
+	similar first (ties keep workbook order)."""
+	matcher = difflib.SequenceMatcher(b="financial summary")
+	def likeness(name):
+		matcher.set_seq1(str(name).strip().lower())
+		return matcher.ratio()
+	return sorted(sheet_names, key=likeness, reverse=True)
+
+
+def _add_period_info(report):
+	"""Derive each sheet's period label / start date once for all combiners."""
+	name = report['path'].name
+	report['master_period_label'] = _derive_period_label(report['master_sheet'], name)
+	report['summary_period_label'] = _derive_period_label(report['summary_sheet'], name)
+	report['period_date'] = _period_start_date(report['summary_sheet'], name)
+	return report
+
+
+# Format of the cached report entries. Bump it whenever load_period_report's
+# output changes (cell conversion, summary columns, ...) so entries parsed by
+# older code are not served for unchanged workbooks.
+REPORT_CACHE_VERSION = 1
+_REPORT_CACHE_TAG = f"period_report:v{REPORT_CACHE_VERSION}"
+
+
+def _read_report_cache(p):
+	"""Return the report dict cached for this version of `p`, or None."""
+	meta_path = cache_file(p, _REPORT_CACHE_TAG, ".json")
+	if meta_path is None or not meta_path.exists():
+		return None
+	try:
+		with open(meta_path) as f:
+			meta = json.load(f)
+		master = None
+		if meta['master_sheet'] is not None:
+			master = pd.read_parquet(cache_file(p, _REPORT_CACHE_TAG))
+	except (ImportError, OSError, ValueError, KeyError):
+		return None
+	summary = meta['summary']
+	if summary is not None:
+		summary = (summary[0], [tuple(r) for r in summary[1]])
+	return {
+		'path': p, 'error': None,
+		'master_sheet': meta['master_sheet'], 'master': master, 'master_error': None,
+		'summary_sheet': meta['summary_sheet'], 'summary_named': meta['summary_named'],
+		'summary': summary, 'summary_error': None,
+	}
+
+
+def _write_report_cache(report):
+	"""Cache a cleanly loaded report: the Master Log as Parquet, the rest as JSON.
+
+	Skipped when anything failed to load or can't be stored (e.g. date cells
+	in the summary, mixed-type Master Log columns).
+	"""
+	if report['error'] or report['master_error'] or report['summary_error']:
+		return
+	meta_path = cache_file(report['path'], _REPORT_CACHE_TAG, ".json")
+	master_path = cache_file(report['path'], _REPORT_CACHE_TAG)
+	if meta_path is None:
+		return
+	meta = {k: report[k] for k in ('master_sheet', 'summary_sheet', 'summary_named', 'summary')}
+	try:
+		meta_path.parent.mkdir(parents=True, exist_ok=True)
+		if report['master'] is not None:
+			report['master'].to_parquet(master_path, compression="zstd")
+		# JSON goes last: its presence marks a complete entry
+		meta_path.write_text(json.dumps(meta))
+	except (ImportError, OSError, ValueError, TypeError):
+		master_path.unlink(missing_ok=True)
+		meta_path.unlink(missing_ok=True)
+	else:
+		prune_cache(meta_path)
+
+
+def load_period_report(path, use_cache=True):
+	"""Open one period report workbook once and extract what every combiner uses.
+
+	Returns a dict with the file 'path', the Master Log sheet name and DataFrame
+	('master_sheet', 'master') and the Financial Summary sheet name and
+	(header, rows) ('summary_sheet', 'summary'). 'summary_named' is False when
+	the summary sheet was only found by scanning sheet contents. Failures are
+	kept under 'error' / 'master_error' / 'summary_error' so each combiner can
+	report them as before. Once the workbook is read, the period labels for the
+	Master Log and summary sheets ('master_period_label', 'summary_period_label')
+	and the summary's period start date ('period_date') are filled in too.
+
+	With `use_cache`, results are cached under SkyeHelpers.CACHE_DIR keyed by
+	path, mtime and size, so re-running on unchanged reports skips Excel.
+	There is no cache unless SKYE_CACHE_DIR is set (see SkyeHelpers).
+	"""
+	p = Path(path)
+	report = {
+		'path': p, 'error': None,
+		'master_sheet': None, 'master': None, 'master_error': None,
+		'summary_sheet': None, 'summary_named': False, 'summary': None, 'summary_error': None,
+	}
+	if not p.exists():
+		report['error'] = FileNotFoundError(str(p))
+		return report
+	if use_cache:
+		cached = _read_report_cache(p)
+		if cached is not None:
+			return _add_period_info(cached)
+	try:
+		xls = _open_report(p)
+	except Exception as e:
+		report['error'] = e
+		return report
+
+	with xls:
+		report['master_sheet'] = _find_master_sheet(xls.sheet_names)
+		if report['master_sheet'] is not None:
+			try:
+				report['master'] = xls.parse(report['master_sheet'])
+			except Exception as e:
+				report['master_error'] = e
+
+		summary_sheet = _find_summary_sheet(xls.sheet_names)
+		report['summary_named'] = summary_sheet is not None
+		if summary_sheet is None:
+			summary_sheet = _scan_for_summary_sheet(xls)
+		report['summary_sheet'] = summary_sheet
+		if summary_sheet is not None:
+			try:
+				report['summary'] = _read_sheet_rows(xls, summary_sheet, ncols=_summary_ncols)
+			except Exception as e:
+				report['summary_error'] = e
+	if use_cache:
+		_write_report_cache(report)
+	return _add_period_info(report)
+
+
+def load_period_reports(report_files, use_cache=True):
+	"""load_period_report over many files, one after another in this process.
+
+	Workbooks are read with calamine (Rust) when it is installed, so a report
+	parses in milliseconds; starting worker processes (spawned, on macOS)
+	costs far more than that.
+	"""
+	return [load_period_report(f, use_cache=use_cache) for f in report_files]
+
+
+def _tokenize_mapping(mapping):
+	"""[(set of label words, value)] for _find_metrics, in mapping order."""
+	return [(set(_TOKEN_RE.findall(k)), v) for k, v in mapping.items()]
+
+
+def _metric_queries(fields):
+	"""Word sets for _find_metrics from {field: [keywords, ...]}, where each
+	keywords tuple (e.g. ('cases sold', 'this period')) is one alternative."""
+	return {
+		field: [set(_TOKEN_RE.findall(' '.join(keywords))) for keywords in alternatives]
+		for field, alternatives in fields.items()
+	}
+
+
+def _find_metrics(mapping_tok, queries):
+	"""Look up every field of `queries` (see _metric_queries) in one pass over
+	the mapping. An alternative matches the first metric whose label has all
+	of its words; a field takes the first alternative that matched a non-NaN
+	value, else NaN."""
+	wanted = [(field, i, words) for field, alternatives in queries.items() for i, words in enumerate(alternatives)]
+	hits = {}
+	for toks, v in mapping_tok:
+		for field, i, words in wanted:
+			if (field, i) not in hits and words.issubset(toks):
+				hits[field, i] = v
+		if len(hits) == len(wanted):
+			break
+	found = {}
+	for field, alternatives in queries.items():
+		value = np.nan
+		for i in range(len(alternatives)):
+			value = hits.get((field, i), np.nan)
+			if not pd.isna(value):
+				break
+		found[field] = value
+	return found
+
+
+# Metrics each combiner reads from a summary sheet
+_FINANCIAL_METRICS = _metric_queries({
+	'shipping': [('shipping', 'collected')],
+	'gross_revenue': [('gross revenue',)],
+	'taxes': [('taxes',)],
+	'cogs': [('cogs',)],
+	'gross_profit': [('gross profit',)],
+})
+_INVENTORY_METRICS = _metric_queries({
+	'starting_inv': [('starting inventory',)],
+	'cases_sold': [('cases sold', 'this period'), ('cases sold',)],
+	'boxes_sold': [('boxes sold', 'this period'), ('boxes sold',)],
+	'bars_sold': [('single bars sold', 'this period'), ('bars sold',)],
+	'case_bars': [('case bars sold',)],
+	'box_bars': [('box bars sold',)],
+	'single_bars': [('single bars sold',)],
+	'total_inv_sold': [('total inventory sold',)],
+	'ending_inv': [('ending inventory',)],
+})
+_POS_METRICS = _metric_queries({
+	'total_pos_bars': [('total pos bars', 'sales members'), ('total pos bars',)],
+	'single_bars_sold': [('single bars sold',), ('bars sold', 'single')],
+	'bars_outstanding': [('bars outstanding',), ('outstanding', 'pos')],
+	'ending_inventory': [('ending inventory',)],
+	'bars_left_3pl': [('bars left at 3pl',), ('bars left', '3pl')],
+})
+
+
+def _find_date_token(sheet_name, filename):
+	"""Return the (start, end) YYYY-MM-DD strings of the first period token
+	in the sheet name, else the filename, or None."""
+	for hay in (sheet_name, filename):
+		if not hay:
+			continue
+		m = _DATE_RANGE_RE.search(str(hay))
+		if m:
+			return m.group(1), m.group(2)
+	return None
+
+
+def _derive_period_label(sheet_name, filename):
+	"""Period label 'MM/DD/YY-MM/DD/YY' from the sheet name or filename token;
+	falls back to the filename."""
+	date_token = _find_date_token(sheet_name, filename)
+	if date_token:
+		try:
+			start_dt = datetime.strptime(date_token[0], "%Y-%m-%d")
+			end_dt = datetime.strptime(date_token[1], "%Y-%m-%d")
+			return f"{start_dt.strftime('%m/%d/%y')}-{end_dt.strftime('%m/%d/%y')}"
+		except ValueError:
+			pass
+	return filename
+
+
+def _period_start_date(sheet_name, filename):
+	"""Start datetime of the period token (used to sort periods), or None."""
+	date_token = _find_date_token(sheet_name, filename)
+	if date_token:
+		try:
+			return datetime.strptime(date_token[0], "%Y-%m-%d")
+		except ValueError:
+			pass
+	return None
+
+
+def _as_reports(report_files, use_cache=True):
+	"""Accept paths or dicts from load_period_report; load any paths."""
+	items = list(report_files)
+	loaded = iter(load_period_reports([f for f in items if not isinstance(f, dict)], use_cache=use_cache))
+	return [f if isinstance(f, dict) else next(loaded) for f in items]
+
+
 def combine_master_logs(report_files, output_path=None, dedupe=False, primary_key=None):
 	"""Combine 'Master Log' sheets from multiple period report Excel files.
 
 	Args:
-		report_files (iterable): list/tuple of Excel file paths.
+		report_files (iterable): list/tuple of Excel file paths, or reports
+			already opened with load_period_report.
 		output_path (str or Path, optional): if provided, write combined sheet to this Excel file.
-		dedupe (bool): if True and primary_key provided, drop duplicate rows by primary_key.
+		dedupe (bool): if True, drop duplicate rows (keeping the first) by primary_key,
+			or rows identical in every source column when primary_key is None.
 		primary_key (str or list, optional): column(s) to use for deduplication.
 
 	Returns:
@@ -64,93 +506,80 @@ def combine_master_logs(report_files, output_path=None, dedupe=False, primary_ke
 	if not report_files:
 		raise ValueError("report_files must be a non-empty iterable of file paths")
 
+	key_cols = [primary_key] if isinstance(primary_key, str) else primary_key
 	combined_frames = []
-	for f in report_files:
-		p = Path(f)
-		if not p.exists():
+	period_labels = []
+	for report in _as_reports(report_files):
+		p = report['path']
+		if isinstance(report['error'], FileNotFoundError):
 			print(f"Warning: file not found, skipping: {p}")
 			continue
-		try:
-			xls = pd.ExcelFile(p)
-		except Exception as e:
-			print(f"Warning: unable to read Excel file {p}: {e}")
+		if report['error'] is not None:
+			print(f"Warning: unable to read Excel file {p}: {report['error']}")
 			continue
 
-		# Find a sheet that matches 'Master Log' (case-insensitive). Accept names
-		# that equal 'master log' or contain both 'master' and 'log'.
-		candidate_sheet = None
-		for s in xls.sheet_names:
-			s_norm = str(s).strip().lower()
-			if s_norm == "master log" or ("master" in s_norm and "log" in s_norm):
-				candidate_sheet = s
-				break
-
+		candidate_sheet = report['master_sheet']
 		if candidate_sheet is None:
 			print(f"No Master Log sheet found in {p.name}; skipping.")
 			continue
 
-		try:
-			df = pd.read_excel(p, sheet_name=candidate_sheet)
-		except Exception as e:
-			print(f"Warning: failed to read sheet '{candidate_sheet}' in {p.name}: {e}")
+		if report['master_error'] is not None:
+			print(f"Warning: failed to read sheet '{candidate_sheet}' in {p.name}: {report['master_error']}")
 			continue
+		df = report['master']
+		if dedupe and (key_cols is None or set(key_cols).issubset(df.columns)):
+			# Drop repeats within the file first so they are never concatenated
+			df = df.drop_duplicates(subset=key_cols)
 
-		# Determine a period label for this source. Prefer a YYYY-MM-DD_to_YYYY-MM-DD
-		# token appearing in the sheet title (candidate_sheet) or filename. If found,
-		# format as MM/DD/YY-MM/DD/YY. Otherwise fall back to the filename.
-		period_label = None
-		# look in the sheet name first (candidate_sheet), then filename
-		date_token = None
-		for hay in (candidate_sheet, p.name):
-			if not hay:
-				continue
-			m = re.search(r"(\d{4}-\d{2}-\d{2})\s*_?to\s*_?(\d{4}-\d{2}-\d{2})", str(hay), re.IGNORECASE)
-			if m:
-				date_token = (m.group(1), m.group(2))
-				break
+		# Period label for this source: a YYYY-MM-DD_to_YYYY-MM-DD token in the
+		# sheet title or filename formatted as MM/DD/YY-MM/DD/YY, else the filename
+		period_label = report['master_period_label']
 
-		if date_token:
-			try:
-				start_dt = datetime.strptime(date_token[0], "%Y-%m-%d")
-				end_dt = datetime.strptime(date_token[1], "%Y-%m-%d")
-				# format as MM/DD/YY-MM/DD/YY
-				period_label = f"{start_dt.strftime('%m/%d/%y')}-{end_dt.strftime('%m/%d/%y')}"
-			except Exception:
-				period_label = None
-
-		if period_label is None:
-			period_label = p.name
-
-		# annotate source period and append
-		df["source_period_report"] = period_label
 		combined_frames.append(df)
+		period_labels.append(period_label)
 
 	if not combined_frames:
 		print("No Master Log sheets found in any provided files.")
 		return None
 
+	# Concatenate the loaded frames as-is (they may be shared, so they aren't
+	# annotated in place) and add the source period column to the result once,
+	# where per-frame df.assign would have put it
 	combined = pd.concat(combined_frames, ignore_index=True, sort=False)
+	source_col = np.repeat(np.array(period_labels, dtype=object), [len(df) for df in combined_frames])
+	if "source_period_report" in combined.columns:
+		combined["source_period_report"] = source_col
+	else:
+		combined.insert(len(combined_frames[0].columns), "source_period_report", source_col)
+
+	if dedupe:
+		# Then across files; the source label differs per file, so it's ignored
+		subset = key_cols if key_cols is not None else combined.columns[combined.columns != "source_period_report"].tolist()
+		combined = combined.drop_duplicates(subset=subset, keep="first", ignore_index=True)
 
-	if dedupe and primary_key is not None:
-		combined = combined.drop_duplicates(subset=primary_key, keep="first")
+	# Columns grouped by normalized (stripped, lower-case) name, in column order
+	cols_by_norm = {}
+	for c, norm in zip(combined.columns, combined.columns.astype(str).str.strip().str.lower()):
+		cols_by_norm.setdefault(norm, []).append(c)
 
 	# Remove exclude_from_bars_sold column
-	exclude_col = "exclude_from_bars_sold"
-	matching_cols = [c for c in combined.columns if str(c).strip().lower() == exclude_col.lower()]
+	matching_cols = cols_by_norm.get("exclude_from_bars_sold", [])
 	if matching_cols:
-		combined = combined.drop(columns=matching_cols)
+		combined.drop(columns=matching_cols, inplace=True)
 	
 	# Combine box_or_bar and box_or_bar_or_case columns
-	box_or_bar_cols = [c for c in combined.columns if str(c).strip().lower() == "box_or_bar"]
-	box_or_bar_or_case_cols = [c for c in combined.columns if str(c).strip().lower() == "box_or_bar_or_case"]
+	box_or_bar_cols = cols_by_norm.get("box_or_bar", [])
+	box_or_bar_or_case_cols = cols_by_norm.get("box_or_bar_or_case", [])
 	
 	if box_or_bar_cols and box_or_bar_or_case_cols:
 		# Both columns exist - combine them (prefer box_or_bar_or_case, fallback to box_or_bar)
-		combined[box_or_bar_or_case_cols[0]] = combined[box_or_bar_or_case_cols[0]].fillna(combined[box_or_bar_cols[0]])
-		combined = combined.drop(columns=box_or_bar_cols)
+		a = combined[box_or_bar_or_case_cols[0]].to_numpy()
+		b = combined[box_or_bar_cols[0]].to_numpy()
+		combined[box_or_bar_or_case_cols[0]] = np.where(pd.isna(a), b, a)
+		combined.drop(columns=box_or_bar_cols, inplace=True)
 	elif box_or_bar_cols and not box_or_bar_or_case_cols:
 		# Only box_or_bar exists - rename it to box_or_bar_or_case
-		combined = combined.rename(columns={box_or_bar_cols[0]: "box_or_bar_or_case"})
+		combined.rename(columns={box_or_bar_cols[0]: "box_or_bar_or_case"}, inplace=True)
 	# If only box_or_bar_or_case exists, keep it as is
 
 	return combined
@@ -167,148 +596,45 @@ def combine_financial_summaries(report_files):
 	if not report_files:
 		raise ValueError("report_files must be a non-empty iterable of file paths")
 
-	# Aggregate totals across all provided files
-	totals = {
-		'Revenue': 0.0,
-		'Shipping_Collected': 0.0,
-		'Gross_Revenue': 0.0,
-		'Taxes_Collected': 0.0,
-		'COGS_Total': 0.0,
-		'Shipping_Costs_Total': 0.0,
-		'Gross_Profit': 0.0,
-	}
+	# One record of metrics per contributing file, summed once after the loop
+	per_file_records = []
 
-	for f in report_files:
-		p = Path(f)
-		if not p.exists():
+	for report in _as_reports(report_files):
+		p = report['path']
+		if isinstance(report['error'], FileNotFoundError):
 			print(f"Warning: file not found, skipping: {p}")
 			continue
-		try:
-			xls = pd.ExcelFile(p)
-		except Exception as e:
-			print(f"Warning: unable to read Excel file {p}: {e}")
+		if report['error'] is not None:
+			print(f"Warning: unable to read Excel file {p}: {report['error']}")
 			continue
 
-		# find candidate financial summary sheet
-		candidate_sheet = None
-		for s in xls.sheet_names:
-			s_norm = str(s).strip().lower()
-			if s_norm == "financial summary" or ("financial" in s_norm and "summary" in s_norm):
-				candidate_sheet = s
-				break
-
-		# fallback: scan sheets for a 'Metric' column or presence of 'Gross Revenue' text
-		if candidate_sheet is None:
-			for s in xls.sheet_names:
-				try:
-					df_test = pd.read_excel(p, sheet_name=s, nrows=50)
-					expl = [str(c).lower() for c in df_test.columns]
-					# check for Metric column
-					if any('metric' == c for c in expl) or any('metric' in c for c in expl):
-						candidate_sheet = s
-						break
-					# or check first column for 'gross revenue'
-					first_col = df_test.columns[0] if len(df_test.columns) > 0 else None
-					if first_col is not None:
-						if df_test[first_col].astype(str).str.lower().str.contains('gross revenue', na=False).any():
-							candidate_sheet = s
-							break
-				except Exception:
-					continue
-
+		candidate_sheet = report['summary_sheet']
 		if candidate_sheet is None:
 			print(f"No Financial Summary sheet found in {p.name}; skipping.")
 			continue
 
-		try:
-			df = pd.read_excel(p, sheet_name=candidate_sheet)
-		except Exception as e:
-			print(f"Warning: failed to read sheet '{candidate_sheet}' in {p.name}: {e}")
+		if report['summary_error'] is not None:
+			print(f"Warning: failed to read sheet '{candidate_sheet}' in {p.name}: {report['summary_error']}")
 			continue
+		header, rows = report['summary']
 
-		# normalize column names
-		df.columns = [str(c).strip() for c in df.columns]
-
-		# find metric and value columns
-		metric_col = None
-		value_col = None
-		for c in df.columns:
-			cl = str(c).lower()
-			if 'metric' in cl:
-				metric_col = c
-			if 'value' in cl:
-				value_col = c
-		# fallback heuristics
-		if metric_col is None:
-			metric_col = df.columns[0]
-		if value_col is None and len(df.columns) > 1:
-			value_col = df.columns[1]
-
-		# helper to parse numeric-like cells
-		def parse_num(v):
-			if pd.isna(v):
-				return np.nan
-			if isinstance(v, (int, float, np.number)):
-				return float(v)
-			s = str(v).strip()
-			if s == '':
-				return np.nan
-			# parentheses for negatives
-			neg = False
-			if s.startswith('(') and s.endswith(')'):
-				neg = True
-				s2 = s.strip('()')
-				# remove $ and commas
-				s2 = s2.replace('$','').replace(',','').replace('\xa0','').strip()
-			# percent
-			if s2.endswith('%'):
-				try:
-					v = float(s2.strip('%'))/100.0
-					return -v if neg else v
-				except Exception:
-					return np.nan
-			try:
-				v = float(s2)
-				return -v if neg else v
-			except Exception:
-				return np.nan
+		# find metric and value columns (by position)
+		metric_col, value_col = _metric_value_cols(header)
 
 		# build a mapping of cleaned metric -> numeric value
-		metric_series = df[metric_col].astype(str).fillna('').tolist()
-		value_series = df[value_col].tolist() if value_col in df.columns else [np.nan]*len(metric_series)
-		mapping = {}
-		for mtxt, v in zip(metric_series, value_series):
-			mt = str(mtxt).strip()
-			mt_clean = re.sub(r"^[\+\-]\s*", "", mt).strip().lower()
-			mapping[mt_clean] = parse_num(v)
-
-		# helper to fetch by keywords
-		def find_metric(*keywords):
-			for k, val in mapping.items():
-				if all(kw in k for kw in keywords):
-					return val
-			return np.nan
+		mapping = _metric_mapping(rows, metric_col, value_col, percent=True)
+		found = _find_metrics(_tokenize_mapping(mapping), _FINANCIAL_METRICS)
 
 		# extract desired fields
-		revenue = find_metric('revenue') if 'revenue' in mapping else np.nan
-		# revenue may be ambiguous (revenue vs gross revenue). Prefer exact 'revenue' key
-		if 'revenue' in mapping:
-			revenue = mapping.get('revenue', revenue)
-
-		shipping = find_metric('shipping', 'collected')
-		gross_revenue = find_metric('gross revenue')
-		taxes = find_metric('taxes') if 'taxes collected' in mapping or any('tax' in k for k in mapping.keys()) else find_metric('tax')
-		cogs = find_metric('cogs')
-		threepl = None
-		# look for '3pl' or 'total 3pl' or 'total 3pl costs' or 'total 3pl costs'
-		for k in mapping.keys():
-			if '3pl' in k or ('total' in k and '3pl' in k) or 'total 3pl' in k or 'total 3pl costs' in k:
-				threepl = mapping.get(k)
-				break
-		if threepl is None:
-			threepl = find_metric('3pl')
-
-		gross_profit = find_metric('gross profit')
+		# revenue may be ambiguous (revenue vs gross revenue), so only the exact 'revenue' key
+		revenue = mapping.get('revenue', np.nan)
+		shipping = found['shipping']
+		gross_revenue = found['gross_revenue']
+		taxes = found['taxes']
+		cogs = found['cogs']
+		# first label mentioning '3pl' (e.g. 'total 3pl costs')
+		threepl = next((v for k, v in mapping.items() if '3pl' in k), np.nan)
+		gross_profit = found['gross_profit']
 
 		# Recalculate gross margin as gross_profit / gross_revenue
 		recalc_gross_margin = np.nan
@@ -325,46 +651,28 @@ def combine_financial_summaries(report_files):
 		if not pd.isna(gross_revenue) and not pd.isna(cogs) and not pd.isna(threepl) and not pd.isna(gross_profit):
 			profit_match = abs(gross_revenue - cogs - threepl - gross_profit) <= tol
 
-		# determine period_label same as combine_master_logs
-		period_label = None
-		date_token = None
-		for hay in (candidate_sheet, p.name):
-			if not hay:
-				continue
-			m = re.search(r"(\d{4}-\d{2}-\d{2})\s*_?to\s*_?(\d{4}-\d{2}-\d{2})", str(hay), re.IGNORECASE)
-			if m:
-				date_token = (m.group(1), m.group(2))
-				break
-		if date_token:
-			try:
-				start_dt = datetime.strptime(date_token[0], "%Y-%m-%d")
-				end_dt = datetime.strptime(date_token[1], "%Y-%m-%d")
-				period_label = f"{start_dt.strftime('%m/%d/%y')}-{end_dt.strftime('%m/%d/%y')}"
-			except Exception:
-				period_label = p.name
-		else:
-			period_label = p.name
+		# period_label is derived the same way as in combine_master_logs
+		period_label = report['summary_period_label']
+
+		per_file_records.append({
+			'Revenue': revenue,
+			'Shipping_Collected': shipping,
+			'Gross_Revenue': gross_revenue,
+			'Taxes_Collected': taxes,
+			'COGS_Total': cogs,
+			'Shipping_Costs_Total': threepl,
+			'Gross_Profit': gross_profit,
+		})
 
-		# Add numeric values to the running totals (treat NaN as 0)
-		def add_tot(key, val):
-			try:
-				totals[key] += 0.0 if pd.isna(val) else float(val)
-			except Exception:
-				pass
-
-		add_tot('Revenue', revenue)
-		add_tot('Shipping_Collected', shipping)
-		add_tot('Gross_Revenue', gross_revenue)
-		add_tot('Taxes_Collected', taxes)
-		add_tot('COGS_Total', cogs)
-		add_tot('Shipping_Costs_Total', threepl)
-		add_tot('Gross_Profit', gross_profit)
-
-	# If we never added any totals, nothing to return
-	if all(v == 0 for v in totals.values()):
-		print("No financial summaries found in any provided files or all values zero.")
+	# If no file had a Financial Summary, nothing to return (a report whose
+	# values are all zero still counts)
+	if not per_file_records:
+		print("No financial summaries found in any provided files.")
 		return None
 
+	# Aggregate totals across all provided files (NaN counts as 0)
+	totals = pd.DataFrame(per_file_records, dtype=float).sum().to_dict()
+
 	# Recalculate gross margin using aggregated totals
 	gross_margin = np.nan
 	if totals['Gross_Revenue'] != 0:
@@ -427,109 +735,35 @@ def combine_inventory_summaries(report_files):
 	# Store inventory data with period dates for sorting
 	inventory_data = []
 	
-	for f in report_files:
-		p = Path(f)
-		if not p.exists():
-			continue
-		
-		try:
-			xls = pd.ExcelFile(p)
-		except Exception:
-			continue
-		
-		# Find Financial Summary sheet
-		candidate_sheet = None
-		for s in xls.sheet_names:
-			s_norm = str(s).strip().lower()
-			if s_norm == "financial summary" or ("financial" in s_norm and "summary" in s_norm):
-				candidate_sheet = s
-				break
-		
-		if candidate_sheet is None:
+	for report in _as_reports(report_files):
+		# Only a sheet named like 'Financial Summary' is used here
+		if report['error'] is not None or not report['summary_named'] or report['summary'] is None:
 			continue
+		header, rows = report['summary']
 		
-		try:
-			df = pd.read_excel(p, sheet_name=candidate_sheet)
-		except Exception:
+		# Metric and value are the first two columns
+		if len(header) < 2:
 			continue
 		
-		# Normalize columns
-		df.columns = [str(c).strip() for c in df.columns]
-		
-		# Find metric and value columns
-		metric_col = df.columns[0] if len(df.columns) > 0 else None
-		value_col = df.columns[1] if len(df.columns) > 1 else None
-		
-		if metric_col is None or value_col is None:
-			continue
-		
-		# Helper to parse numeric values
-		def parse_num(v):
-			if pd.isna(v):
-				return np.nan
-			if isinstance(v, (int, float, np.number)):
-				return float(v)
-			s = str(v).strip()
-			if s == '':
-				return np.nan
-			# Handle negatives in parentheses
-			neg = False
-			if s.startswith('(') and s.endswith(')'):
-				neg = True
-				s = s.strip('()')
-			s = s.replace('$','').replace(',','').replace('\xa0','').strip()
-			try:
-				v = float(s)
-				return -v if neg else v
-			except Exception:
-				return np.nan
-		
 		# Build mapping
-		metric_series = df[metric_col].astype(str).fillna('').tolist()
-		value_series = df[value_col].tolist()
-		mapping = {}
-		for mtxt, v in zip(metric_series, value_series):
-			mt = str(mtxt).strip()
-			mt_clean = re.sub(r"^[\+\-]\s*", "", mt).strip().lower()
-			mapping[mt_clean] = parse_num(v)
-		
-		# Helper to find metrics by keywords
-		def find_metric(*keywords):
-			for k, val in mapping.items():
-				if all(kw in k for kw in keywords):
-					return val
-			return np.nan
+		mapping = _metric_mapping(rows, 0, 1)
+		found = _find_metrics(_tokenize_mapping(mapping), _INVENTORY_METRICS)
 		
 		# Extract inventory metrics
-		starting_inv = find_metric('starting inventory')
-		cases_sold = find_metric('cases sold', 'this period') if find_metric('cases sold', 'this period') == find_metric('cases sold', 'this period') else find_metric('cases sold')
-		boxes_sold = find_metric('boxes sold', 'this period') if find_metric('boxes sold', 'this period') == find_metric('boxes sold', 'this period') else find_metric('boxes sold')
-		bars_sold = find_metric('single bars sold', 'this period') if find_metric('single bars sold', 'this period') == find_metric('single bars sold', 'this period') else find_metric('bars sold')
+		starting_inv = found['starting_inv']
+		cases_sold = found['cases_sold']
+		boxes_sold = found['boxes_sold']
+		bars_sold = found['bars_sold']
 		
-		case_bars = find_metric('case bars sold')
-		box_bars = find_metric('box bars sold')
-		single_bars = find_metric('single bars sold') if 'single bars sold' in ' '.join(mapping.keys()) else bars_sold
+		case_bars = found['case_bars']
+		box_bars = found['box_bars']
+		single_bars = found['single_bars'] if 'single bars sold' in ' '.join(mapping.keys()) else bars_sold
 		
-		total_inv_sold = find_metric('total inventory sold')
-		ending_inv = find_metric('ending inventory')
+		total_inv_sold = found['total_inv_sold']
+		ending_inv = found['ending_inv']
 		
 		# Extract period date for sorting (earliest to latest)
-		period_date = None
-		date_token = None
-		for hay in (candidate_sheet, p.name):
-			if not hay:
-				continue
-			m = re.search(r"(\d{4}-\d{2}-\d{2})\s*_?to\s*_?(\d{4}-\d{2}-\d{2})", str(hay), re.IGNORECASE)
-			if m:
-				date_token = (m.group(1), m.group(2))
-				break
-		
-		if date_token:
-			try:
-				start_dt = datetime.strptime(date_token[0], "%Y-%m-%d")
-				period_date = start_dt
-			except Exception:
-				period_date = None
+		period_date = report['period_date']
 		
 		inventory_data.append({
 			'period_date': period_date,
@@ -649,114 +883,29 @@ def combine_pos_summary(report_files):
 	# Store POS data with period dates for sorting
 	pos_data = []
 	
-	for f in report_files:
-		p = Path(f)
-		if not p.exists():
-			continue
-		
-		try:
-			xls = pd.ExcelFile(p)
-		except Exception:
-			continue
-		
-		# Find Financial Summary sheet
-		candidate_sheet = None
-		for s in xls.sheet_names:
-			s_norm = str(s).strip().lower()
-			if s_norm == "financial summary" or ("financial" in s_norm and "summary" in s_norm):
-				candidate_sheet = s
-				break
-		
-		if candidate_sheet is None:
+	for report in _as_reports(report_files):
+		# Only a sheet named like 'Financial Summary' is used here
+		if report['error'] is not None or not report['summary_named'] or report['summary'] is None:
 			continue
+		header, rows = report['summary']
 		
-		try:
-			df = pd.read_excel(p, sheet_name=candidate_sheet)
-		except Exception:
+		# Metric and value are the first two columns
+		if len(header) < 2:
 			continue
 		
-		# Normalize columns
-		df.columns = [str(c).strip() for c in df.columns]
-		
-		# Find metric and value columns
-		metric_col = df.columns[0] if len(df.columns) > 0 else None
-		value_col = df.columns[1] if len(df.columns) > 1 else None
-		
-		if metric_col is None or value_col is None:
-			continue
-		
-		# Helper to parse numeric values
-		def parse_num(v):
-			if pd.isna(v):
-				return np.nan
-			if isinstance(v, (int, float, np.number)):
-				return float(v)
-			s = str(v).strip()
-			if s == '':
-				return np.nan
-			# Handle negatives in parentheses
-			neg = False
-			if s.startswith('(') and s.endswith(')'):
-				neg = True
-				s = s.strip('()')
-			s = s.replace('$','').replace(',','').replace('\xa0','').strip()
-			try:
-				v = float(s)
-				return -v if neg else v
-			except Exception:
-				return np.nan
-		
 		# Build mapping
-		metric_series = df[metric_col].astype(str).fillna('').tolist()
-		value_series = df[value_col].tolist()
-		mapping = {}
-		for mtxt, v in zip(metric_series, value_series):
-			mt = str(mtxt).strip()
-			mt_clean = re.sub(r"^[\+\-]\s*", "", mt).strip().lower()
-			mapping[mt_clean] = parse_num(v)
-		
-		# Helper to find metrics by keywords
-		def find_metric(*keywords):
-			for k, val in mapping.items():
-				if all(kw in k for kw in keywords):
-					return val
-			return np.nan
+		mapping = _metric_mapping(rows, 0, 1)
+		found = _find_metrics(_tokenize_mapping(mapping), _POS_METRICS)
 		
 		# Extract POS metrics
-		total_pos_bars = find_metric('total pos bars', 'sales members')
-		if pd.isna(total_pos_bars):
-			total_pos_bars = find_metric('total pos bars')
-		
-		single_bars_sold = find_metric('single bars sold')
-		if pd.isna(single_bars_sold):
-			single_bars_sold = find_metric('bars sold', 'single')
-		
-		bars_outstanding = find_metric('bars outstanding')
-		if pd.isna(bars_outstanding):
-			bars_outstanding = find_metric('outstanding', 'pos')
-		
-		ending_inventory = find_metric('ending inventory')
-		bars_left_3pl = find_metric('bars left at 3pl')
-		if pd.isna(bars_left_3pl):
-			bars_left_3pl = find_metric('bars left', '3pl')
+		total_pos_bars = found['total_pos_bars']
+		single_bars_sold = found['single_bars_sold']
+		bars_outstanding = found['bars_outstanding']
+		ending_inventory = found['ending_inventory']
+		bars_left_3pl = found['bars_left_3pl']
 		
 		# Extract period date for sorting (earliest to latest)
-		period_date = None
-		date_token = None
-		for hay in (candidate_sheet, p.name):
-			if not hay:
-				continue
-			m = re.search(r"(\d{4}-\d{2}-\d{2})\s*_?to\s*_?(\d{4}-\d{2}-\d{2})", str(hay), re.IGNORECASE)
-			if m:
-				date_token = (m.group(1), m.group(2))
-				break
-		
-		if date_token:
-			try:
-				start_dt = datetime.strptime(date_token[0], "%Y-%m-%d")
-				period_date = start_dt
-			except Exception:
-				period_date = None
+		period_date = report['period_date']
 		
 		pos_data.append({
 			'period_date': period_date,
@@ -859,15 +1008,44 @@ def combine_pos_summary(report_files):
 	return summary
 
 
-def combine_period_reports(report_files, output_path):
+def _excel_writer(path):
+	"""pd.ExcelWriter on xlsxwriter (pip install xlsxwriter), which streams
+	the sheet XML, falling back to openpyxl when it isn't installed.
+
+	Strings that look like URLs stay plain text, as they are with openpyxl.
+	"""
+	try:
+		return pd.ExcelWriter(path, engine="xlsxwriter", engine_kwargs={"options": {"strings_to_urls": False}})
+	except ImportError:
+		return pd.ExcelWriter(path, engine="openpyxl")
+
+
+def _escape_summary(df):
+	"""Summary frame with its Metric and Note text escaped. Only those two
+	columns are new; the rest are shared with `df`."""
+	return df.assign(**{
+		col: escape_excel_formulas(df[col]) for col in ('Metric', 'Note') if col in df.columns
+	})
+
+
+def _column_widths(df):
+	"""Auto-size widths for `df` written with its header: the longest str() of
+	the header or any non-blank value, plus 2, capped at 50."""
+	return np.minimum(column_widths(df) + 2, 50).tolist()
+
+
+def combine_period_reports(report_files, output_path, use_cache=True):
 	"""Orchestrate combining all period reports into a single Excel workbook.
 	
 	Combines Master Logs and Financial Summaries (financials + inventory + POS)
 	from multiple period report Excel files into a single output file.
 	
 	Args:
-		report_files (iterable): list/tuple of Excel file paths.
+		report_files (iterable): list/tuple of Excel file paths (or dicts from
+			load_period_report).
 		output_path (str or Path): path to write the combined Excel workbook.
+		use_cache (bool): reuse/refresh the parsed-report cache (see
+			load_period_report).
 	
 	Returns:
 		bool: True if successful, False otherwise.
@@ -877,9 +1055,12 @@ def combine_period_reports(report_files, output_path):
 	
 	print("Combining period reports...")
 	
+	# Open and parse each workbook once; every combiner below reuses the result
+	reports = _as_reports(report_files, use_cache=use_cache)
+	
 	# ---- COMBINE MASTER LOGS ----
 	print("\n1. Combining Master Logs...")
-	master_combined = combine_master_logs(report_files)
+	master_combined = combine_master_logs(reports)
 	if master_combined is None:
 		print("Warning: No master logs found. Continuing with summaries only.")
 		master_combined = pd.DataFrame()
@@ -888,7 +1069,7 @@ def combine_period_reports(report_files, output_path):
 	
 	# ---- COMBINE FINANCIAL SUMMARIES ----
 	print("\n2. Combining Financial Summaries...")
-	fin_result = combine_financial_summaries(report_files)
+	fin_result = combine_financial_summaries(reports)
 	if fin_result is None:
 		print("Warning: No financial summaries found. Continuing with other sections.")
 		fin_summary = pd.DataFrame()
@@ -898,7 +1079,7 @@ def combine_period_reports(report_files, output_path):
 	
 	# ---- COMBINE INVENTORY SUMMARIES ----
 	print("\n3. Combining Inventory Summaries...")
-	inv_summary = combine_inventory_summaries(report_files)
+	inv_summary = combine_inventory_summaries(reports)
 	if inv_summary is None:
 		print("Warning: No inventory summaries found. Continuing with other sections.")
 		inv_summary = pd.DataFrame()
@@ -907,7 +1088,7 @@ def combine_period_reports(report_files, output_path):
 	
 	# ---- COMBINE POS SUMMARIES ----
 	print("\n4. Combining POS Summaries...")
-	pos_summary = combine_pos_summary(report_files)
+	pos_summary = combine_pos_summary(reports)
 	if pos_summary is None:
 		print("Warning: No POS summaries found. Continuing with other sections.")
 		pos_summary = pd.DataFrame()
@@ -934,75 +1115,73 @@ def combine_period_reports(report_files, output_path):
 	# ---- WRITE TO EXCEL ----
 	print(f"\n6. Writing to Excel: {output_path}")
 	try:
-		with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
+		with _excel_writer(output_path) as writer:
+			# Frames written, by sheet name (for xlsxwriter column widths)
+			written = {}
+
 			# Sheet 1: Master Log (if available)
 			if not master_combined.empty:
 				master_combined.to_excel(writer, sheet_name="Master Log", index=False)
+				written["Master Log"] = master_combined
 				print(f"   ✓ Master Log sheet written ({len(master_combined)} rows)")
 			
 			# Sheet 2: Financial Summary (combined sections)
 			if not combined_summary.empty:
-				summary_escaped = combined_summary.copy()
-				def _escape_cell(val):
-					if isinstance(val, str) and val and val[0] in ('=', '+', '-'):
-						return "'" + val
-					return val
-				if 'Metric' in summary_escaped.columns:
-					summary_escaped['Metric'] = summary_escaped['Metric'].apply(_escape_cell)
-				if 'Note' in summary_escaped.columns:
-					summary_escaped['Note'] = summary_escaped['Note'].apply(_escape_cell)
+				summary_escaped = _escape_summary(combined_summary)
 				summary_escaped.to_excel(writer, sheet_name="Financial Summary", index=False)
+				written["Financial Summary"] = summary_escaped
 				print(f"   ✓ Financial Summary sheet written ({len(combined_summary)} rows)")
 				
 				# Apply accounting format to numeric cells in Value column (column B)
 				# BUT ONLY for the Financial Summary section (not Inventory or POS sections)
-				wb = writer.book
-				ws = wb["Financial Summary"]
 				accounting_format = '_($* #,##0.00_);_($* (#,##0.00);_($* "-"_);_(@_)'
 				percentage_format = '0.00%'
-				
-				# Find the Value column (should be column B, index 2)
-				value_col_idx = None
-				metric_col_idx = None
-				for idx, col in enumerate(ws[1], start=1):
-					if col.value == "Value":
-						value_col_idx = idx
-					if col.value == "Metric":
-						metric_col_idx = idx
-				
-				if value_col_idx and metric_col_idx:
-					# Only apply to Financial Summary rows (first section)
-					# Row 1 is header, financial summary starts at row 2
-					fin_summary_end_row = 1 + len(fin_summary) if not fin_summary.empty else 1
-					
-					# Apply accounting format only to financial summary rows (except Gross Margin)
-					for row in range(2, fin_summary_end_row + 1):
-						metric_cell = ws.cell(row=row, column=metric_col_idx)
-						value_cell = ws.cell(row=row, column=value_col_idx)
-						
-						# Only apply format if cell contains a number
-						if isinstance(value_cell.value, (int, float, np.number)) and not pd.isna(value_cell.value):
-							# Check if this is the Gross Margin row
-							if metric_cell.value and 'gross margin' in str(metric_cell.value).lower():
-								value_cell.number_format = percentage_format
-							else:
-								value_cell.number_format = accounting_format
+
+				cols = list(summary_escaped.columns)
+				# Nothing to format when only inventory/POS sections were found
+				if not fin_summary.empty and "Value" in cols and "Metric" in cols:
+					# Which financial rows hold a number, and which of those is
+					# Gross Margin, worked out once from the frame
+					value_col = len(cols) - 1 - cols[::-1].index("Value")
+					metric_col = len(cols) - 1 - cols[::-1].index("Metric")
+					fin_rows = summary_escaped.iloc[:len(fin_summary)]
+					values = fin_rows.iloc[:, value_col].tolist()
+					is_margin = (
+						fin_rows.iloc[:, metric_col].astype(str).str.lower()
+						.str.contains("gross margin", regex=False).to_numpy()
+					)
+					num_rows = [
+						i for i, v in enumerate(values)
+						if isinstance(v, (int, float, np.number)) and not isinstance(v, bool) and not pd.isna(v)
+					]
+
+					if writer.engine == "xlsxwriter":
+						# xlsxwriter can't restyle written cells, so the numeric
+						# Value cells are re-written with one of two shared formats
+						ws = writer.sheets["Financial Summary"]
+						acct_fmt = writer.book.add_format({"num_format": accounting_format})
+						pct_fmt = writer.book.add_format({"num_format": percentage_format})
+						for i in num_rows:
+							ws.write_number(i + 1, value_col, values[i], pct_fmt if is_margin[i] else acct_fmt)
+					else:
+						# Two named styles registered once; cells then reference
+						# them by name instead of each getting its own style copy
+						wb = writer.book
+						for name, fmt in (("Accounting Value", accounting_format), ("Percent Value", percentage_format)):
+							if name not in wb.named_styles:
+								wb.add_named_style(NamedStyle(name=name, number_format=fmt))
+						ws = wb["Financial Summary"]
+						for i in num_rows:
+							ws.cell(row=i + 2, column=value_col + 1).style = "Percent Value" if is_margin[i] else "Accounting Value"
 			
-			# Auto-size columns
-			wb = writer.book
-			for sheet_name in wb.sheetnames:
-				ws = wb[sheet_name]
-				for col in ws.columns:
-					max_length = 0
-					col_letter = col[0].column_letter
-					for cell in col:
-						try:
-							cell_value = "" if cell.value is None else str(cell.value)
-							if len(cell_value) > max_length:
-								max_length = len(cell_value)
-						except Exception:
-							pass
-					ws.column_dimensions[col_letter].width = min(max_length + 2, 50)
+			# Auto-size columns from the frames written (no cells to read back)
+			for sheet_name, df in written.items():
+				ws = writer.sheets[sheet_name]
+				for i, width in enumerate(_column_widths(df)):
+					if writer.engine == "xlsxwriter":
+						ws.set_column(i, i, width)
+					else:
+						ws.column_dimensions[get_column_letter(i + 1)].width = width
 		
 		print(f"\n✓ Successfully wrote combined report to: {output_path}")
 		return True
@@ -1012,19 +1191,33 @@ def combine_period_reports(report_files, output_path):
 		return False
 
 if __name__ == "__main__":
-	# Runner: open picker and print chosen files (or accept CLI args)
-	args = sys.argv[1:]
-	if args:
-		chosen = args
+	# Runner: open pickers for anything not given on the command line
+	import argparse
+	parser = argparse.ArgumentParser(description="Combine period report workbooks.")
+	parser.add_argument("files", nargs="*", help="period report workbooks (default: pick in a dialog)")
+	parser.add_argument("--output-dir", help="folder for the combined workbook (default: pick in a dialog)")
+	parser.add_argument("--choice", choices=["1", "2", "3", "4", "5"], help="test option to run (default: prompt)")
+	parser.add_argument("--no-cache", action="store_true", help="re-parse every workbook instead of using the cached copy")
+	parser.add_argument("--no-gui", action="store_true", help="never open a dialog; files and --output-dir are required")
+	args = parser.parse_args()
+	if args.no_gui and not (args.files and args.output_dir):
+		parser.error("--no-gui needs report files and --output-dir")
+	use_cache = not args.no_cache
+
+	if args.files:
+		chosen = args.files
 	else:
 		chosen = pick_report_files()
 
 	if not chosen:
 		print("No files selected.")
+		_close_tk_root()
 		sys.exit(0)
 
 	# Prompt for output directory
-	output_dir = pick_output_directory()
+	output_dir = args.output_dir or pick_output_directory()
+	# All dialogs are done; release the shared Tk root
+	_close_tk_root()
 	if not output_dir:
 		print("No output folder selected. Exiting.")
 		sys.exit(0)
@@ -1045,19 +1238,22 @@ if __name__ == "__main__":
 	print("5. Test Full Combined Report (all sections)")
 	print("="*60)
 	
-	choice = input("Enter choice (1-5): ").strip()
+	choice = args.choice or input("Enter choice (1-5): ").strip()
+
+	# Parse the selected workbooks once for whichever option runs below
+	reports = load_period_reports(chosen, use_cache=use_cache)
 
 	if choice == "1":
 		# --- Test: combine master logs ---
 		print("\nCombining Master Log sheets from selected files...")
-		master_result = combine_master_logs(chosen)
+		master_result = combine_master_logs(reports)
 		if master_result is None:
 			print("No master logs were combined. Exiting.")
 			sys.exit(0)
 
 		out_file = Path(output_dir) / "combined_master_log.xlsx"
 		try:
-			with pd.ExcelWriter(out_file, engine="openpyxl") as writer:
+			with _excel_writer(out_file) as writer:
 				master_result.to_excel(writer, sheet_name="Master Log", index=False)
 			print(f"Combined master log written to: {out_file}")
 		except Exception as e:
@@ -1067,7 +1263,7 @@ if __name__ == "__main__":
 	elif choice == "2":
 		# --- Test: combine financial summaries ---
 		print("\nCombining Financial Summary sheets from selected files...")
-		fin_result = combine_financial_summaries(chosen)
+		fin_result = combine_financial_summaries(reports)
 		if fin_result is None:
 			print("No financial summaries were combined. Exiting.")
 			sys.exit(0)
@@ -1075,16 +1271,8 @@ if __name__ == "__main__":
 		_, fin_summary = fin_result
 		out_file = Path(output_dir) / "combined_financial_summary.xlsx"
 		try:
-			with pd.ExcelWriter(out_file, engine="openpyxl") as writer:
-				summary_escaped = fin_summary.copy()
-				def _escape_cell(val):
-					if isinstance(val, str) and val and val[0] in ('=', '+', '-'):
-						return "'" + val
-					return val
-				if 'Metric' in summary_escaped.columns:
-					summary_escaped['Metric'] = summary_escaped['Metric'].apply(_escape_cell)
-				if 'Note' in summary_escaped.columns:
-					summary_escaped['Note'] = summary_escaped['Note'].apply(_escape_cell)
+			with _excel_writer(out_file) as writer:
+				summary_escaped = _escape_summary(fin_summary)
 				summary_escaped.to_excel(writer, sheet_name="Financial Summary", index=False)
 			print(f"Combined financial summary written to: {out_file}")
 		except Exception as e:
@@ -1094,23 +1282,15 @@ if __name__ == "__main__":
 	elif choice == "3":
 		# --- Test: combine inventory summaries ---
 		print("\nCombining Inventory Summary sheets from selected files...")
-		inv_result = combine_inventory_summaries(chosen)
+		inv_result = combine_inventory_summaries(reports)
 		if inv_result is None:
 			print("No inventory summaries were combined. Exiting.")
 			sys.exit(0)
 
 		out_file = Path(output_dir) / "combined_inventory_summary.xlsx"
 		try:
-			with pd.ExcelWriter(out_file, engine="openpyxl") as writer:
-				summary_escaped = inv_result.copy()
-				def _escape_cell(val):
-					if isinstance(val, str) and val and val[0] in ('=', '+', '-'):
-						return "'" + val
-					return val
-				if 'Metric' in summary_escaped.columns:
-					summary_escaped['Metric'] = summary_escaped['Metric'].apply(_escape_cell)
-				if 'Note' in summary_escaped.columns:
-					summary_escaped['Note'] = summary_escaped['Note'].apply(_escape_cell)
+			with _excel_writer(out_file) as writer:
+				summary_escaped = _escape_summary(inv_result)
 				summary_escaped.to_excel(writer, sheet_name="Inventory Summary", index=False)
 			print(f"Combined inventory summary written to: {out_file}")
 		except Exception as e:
@@ -1120,23 +1300,15 @@ if __name__ == "__main__":
 	elif choice == "4":
 		# --- Test: combine POS summaries ---
 		print("\nCombining POS Summary sheets from selected files...")
-		pos_result = combine_pos_summary(chosen)
+		pos_result = combine_pos_summary(reports)
 		if pos_result is None:
 			print("No POS summaries were combined. Exiting.")
 			sys.exit(0)
 
 		out_file = Path(output_dir) / "combined_pos_summary.xlsx"
 		try:
-			with pd.ExcelWriter(out_file, engine="openpyxl") as writer:
-				summary_escaped = pos_result.copy()
-				def _escape_cell(val):
-					if isinstance(val, str) and val and val[0] in ('=', '+', '-'):
-						return "'" + val
-					return val
-				if 'Metric' in summary_escaped.columns:
-					summary_escaped['Metric'] = summary_escaped['Metric'].apply(_escape_cell)
-				if 'Note' in summary_escaped.columns:
-					summary_escaped['Note'] = summary_escaped['Note'].apply(_escape_cell)
+			with _excel_writer(out_file) as writer:
+				summary_escaped = _escape_summary(pos_result)
 				summary_escaped.to_excel(writer, sheet_name="POS Summary", index=False)
 			print(f"Combined POS summary written to: {out_file}")
 		except Exception as e:
@@ -1147,7 +1319,7 @@ if __name__ == "__main__":
 		# --- Test: full combined report ---
 		print("\nCombining full period report (all sections)...")
 		out_file = Path(output_dir) / "combined_period_report.xlsx"
-		success = combine_period_reports(chosen, out_file)
+		success = combine_period_reports(reports, out_file)
 		if success:
 			print(f"\nFull combined report successfully created: {out_file}")
 		else:
@@ -1,116 +1,56 @@
 #!/usr/bin/env python3
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
-# ---- CONSTANTS ----
-# Per-bar COGS from: 39,891.91 / 15,848
-PER_BAR_COGS = 39891.91 / 15848  # ≈ 2.517...
+# Make the repo root importable when run as `python extra/OnlyCaptures3PL.py`
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from skyepipeline_files.SkyeHelpers import (
+    PER_BAR_COGS,
+    classify_sample_items,
+    compute_bars_sold_vec,
+    compute_total_shipping_vec,
+    read_orders_csv,
+    read_threepl_excel,
+)
 
 # ---- HELPER FUNCTIONS ----
 
-def classify_shopify_item(price):
+def classify_shopify_items(prices):
     """
-    For Shopify rows:
+    For Shopify rows in this captures-only log (vectorized):
     box = line item price > 20
     bar  = line item price < 5
     otherwise None
     """
-    try:
-        p = float(price)
-    except (TypeError, ValueError):
-        return None
-    if p > 20:
-        return "box"
-    elif p < 5:
-        return "bar"
-    else:
-        return None
-
-
-def classify_sample_item(total_price, qty):
-    """
-    For free sample 3PL rows:
-    box = total price / quantity > 20
-    bar = total price / quantity < 10
-    otherwise None
-    """
-    try:
-        total_price = float(total_price)
-        qty = float(qty)
-        if qty <= 0:
-            return None
-        unit = total_price / qty
-    except (TypeError, ValueError, ZeroDivisionError):
-        return None
-
-    if unit > 20:
-        return "box"
-    elif unit < 10:
-        return "bar"
-    else:
-        return None
-
-
-def compute_bars_sold(item_type, qty):
-    """
-    7 bars per box.
-    """
-    if pd.isna(qty):
-        return 0
-    if item_type == "box":
-        return qty * 7
-    elif item_type == "bar":
-        return qty
-    else:
-        return 0
-
-
-def compute_bar_cogs(item_type, qty):
-    bars = compute_bars_sold(item_type, qty)
-    return bars * PER_BAR_COGS
-
-
-def compute_total_shipping(row):
-    """
-    Total shipping cost (3PL):
-    Handling Fee + Total Shipping Cost + Packaging
-    """
-    vals = []
-    for col in ["Handling Fee", "Total Shipping Cost", "Packaging"]:
-        if col in row:
-            vals.append(pd.to_numeric(row[col], errors="coerce"))
-        else:
-            vals.append(0)
-    return sum(v if pd.notna(v) else 0 for v in vals)
+    p = pd.to_numeric(prices, errors="coerce")
+    return np.select([p > 20, p < 5], ["box", "bar"], default=None)
 
 
 # ---- CORE LOGIC ----
 
 def build_master_log(orders_path, threepl_path, output_path):
     # Read inputs
-    orders = pd.read_csv(orders_path)
-    threepl = pd.read_excel(threepl_path)
+    orders = read_orders_csv(orders_path)
+    threepl = read_threepl_excel(threepl_path)
 
     # Only care about shipment rows in 3PL sheet
-    shipments = threepl[threepl["Type"] == "Shipment Order"].copy()
+    shipments = threepl[threepl["Type"] == "Shipment Order"]
 
     # ---- NORMAL ORDERS: Shopify orders that have 3PL charges ----
 
-    # Only grab orders whose IDs appear in the 3PL "Store Order Number"
-    valid_ids = shipments["Store Order Number"].dropna().unique()
-    shopify = orders[orders["Name"].isin(valid_ids)].copy()
+    threepl_orders = shipments[shipments["Store Order Number"].notna()]
 
-    threepl_orders = shipments[shipments["Store Order Number"].notna()].copy()
-
-    # Merge Shopify line items with their matching 3PL shipment row
-    merged = shopify.merge(
+    # Merge Shopify line items with their matching 3PL shipment row. The inner
+    # join only keeps orders whose IDs appear in the 3PL "Store Order Number"
+    merged = orders.merge(
         threepl_orders[
             ["Store Order Number", "Handling Fee", "Total Shipping Cost", "Packaging"]
         ],
         left_on="Name",
         right_on="Store Order Number",
-        how="left",
+        how="inner",
     )
 
     # Clean / compute fields for normal orders
@@ -121,14 +61,13 @@ def build_master_log(orders_path, threepl_path, output_path):
         merged["Lineitem price"], errors="coerce"
     )
 
-    merged["box_or_bar"] = merged["line_item_price"].apply(classify_shopify_item)
-    merged["total_bars_sold"] = merged.apply(
-        lambda r: compute_bars_sold(r["box_or_bar"], r["line_item_quantity"]), axis=1
-    )
-    merged["bar_cogs"] = merged.apply(
-        lambda r: compute_bar_cogs(r["box_or_bar"], r["line_item_quantity"]), axis=1
+    merged["box_or_bar"] = classify_shopify_items(merged["line_item_price"])
+    merged["total_bars_sold"] = compute_bars_sold_vec(
+        merged["box_or_bar"], merged["line_item_quantity"]
     )
-    merged["total_shipping_cost"] = merged.apply(compute_total_shipping, axis=1)
+    merged["bar_cogs"] = merged["total_bars_sold"] * PER_BAR_COGS
+    # Missing 3PL costs count as 0 in this log
+    merged["total_shipping_cost"] = compute_total_shipping_vec(merged).fillna(0)
 
     merged_rows = pd.DataFrame(
         {
@@ -164,16 +103,14 @@ def build_master_log(orders_path, threepl_path, output_path):
         pd.to_numeric(samples["Total Price"], errors="coerce")
         / samples["line_item_quantity"]
     )
-    samples["box_or_bar"] = samples.apply(
-        lambda r: classify_sample_item(r["Total Price"], r["Total Quantity"]), axis=1
-    )
-    samples["total_bars_sold"] = samples.apply(
-        lambda r: compute_bars_sold(r["box_or_bar"], r["line_item_quantity"]), axis=1
+    samples["box_or_bar"] = classify_sample_items(
+        samples["unit_price"], samples["line_item_quantity"]
     )
-    samples["bar_cogs"] = samples.apply(
-        lambda r: compute_bar_cogs(r["box_or_bar"], r["line_item_quantity"]), axis=1
+    samples["total_bars_sold"] = compute_bars_sold_vec(
+        samples["box_or_bar"], samples["line_item_quantity"]
     )
-    samples["total_shipping_cost"] = samples.apply(compute_total_shipping, axis=1)
+    samples["bar_cogs"] = samples["total_bars_sold"] * PER_BAR_COGS
+    samples["total_shipping_cost"] = compute_total_shipping_vec(samples).fillna(0)
 
     sample_rows = pd.DataFrame(
         {
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
+import os
+import math
 import pandas as pd
 import numpy as np
-import openpyxl.utils as get_column_letter
-from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
 
 """
 BuildWeeklyWorkbook.py
@@ -18,113 +19,270 @@ Key operations performed:
      between the Master Log and the summary inputs.
  - Builds a readable summary table (rows with escaped leading `+`/`-` so
      Excel does not treat them as formulas) and autosizes columns for neat output.
- - Writes the two-sheet workbook to `output_path` using `openpyxl` engine.
+ - Writes the two-sheet workbook to `output_path` with the Rust-backed
+     `jetxl` writer when installed, else with pandas `to_excel` (xlsxwriter
+     or openpyxl).
 
 Notes:
  - Cells that begin with `+` or `-` are escaped to avoid Excel formula parsing.
- - The module auto-sizes columns for readability and requires `openpyxl` to
-     write `.xlsx` files.
+ - The module auto-sizes columns for readability.
 """
 
 #TODO: CHANGE WEEKLY_ENDING_INVENTORY TO JUST ENDING INVENTORY THROUGHOUT
 
+# Master-log columns the workbook does arithmetic on
+MASTER_NUMERIC_COLS = ["subtotal", "discount", "shipping", "tax", "bar_cogs", "total_shipping_cost", "total_bars_sold"]
+
+# Summary columns read as numbers
+SUMMARY_NUMERIC_COLS = [
+    "Gross_Revenue",  # may or may not be used
+    "Shipping_Collected",
+    "Taxes_Collected",
+    "COGS_Total",
+    "Shipping_Costs_Total",
+    "Shipping_Costs_Orders",
+    "Receiving_Sum",
+    "Payment_Processing_Fee",
+    "Gross_Profit",
+    "Gross_Margin",
+    "Starting_Inventory_Bars",
+    "Boxes_Sold_This_Week",
+    "Bars_Sold_This_Week",
+    "Total_Inventory_Sold_Bars",
+    "Weekly_Ending_Inventory_Bars",
+]
+
+# Financial Summary tab header
+SUMMARY_HEADER = ("Metric", "Value", "Note")
+
+# Financial Summary separator rows (escaped like any other label when written)
+SEPARATOR_THICK = "=" * 54
+SEPARATOR_THIN = "-" * 54
+
+# Financial Summary number formats, attached to each row where it is built
+CURRENCY_FORMAT = '"$"#,##0.00'
+PERCENT_FORMAT = '0.00%'  # values are fractions (e.g. 0.25)
+COUNT_FORMAT = '#,##0'    # inventory / units
+DATE_FORMAT = "yyyy-mm-dd hh:mm:ss"  # any datetime cell
+
+
 def escape_excel_formula(text):
     if isinstance(text, str) and text and text[0] in ("=", "+", "-"):
         return "'" + text
     return text
 
-def autosize_columns(ws):
-    for col in ws.columns:
-        max_length = 0
-        # First cell in the column
-        first_cell = col[0]
-        # Get the column letter directly from the cell
-        col_letter = first_cell.column_letter
-
-        for cell in col:
-            try:
-                cell_value = "" if cell.value is None else str(cell.value)
-                if len(cell_value) > max_length:
-                    max_length = len(cell_value)
-            except Exception:
-                pass
 
-        # Add a little padding
-        adjusted_width = max_length + 2
-        ws.column_dimensions[col_letter].width = adjusted_width
+def escape_excel_formulas(values):
+    """
+    Vectorized `escape_excel_formula` over a Series. Non-text values are
+    left unchanged.
+    """
+    try:
+        mask = values.str.startswith(("=", "+", "-")).fillna(False).astype(bool)
+    except AttributeError:
+        # no text in the Series
+        return values
+    return values.where(~mask, "'" + values[mask])
 
 
-def build_weekly_workbook(
-    master,
-    weekly_summary,
-    output_path="Skye_Weekly_Report.xlsx",
-    pos_bars=None,
-    tot_pos_bars=None,
-):
+def coerce_numeric(df, cols):
     """
-    Build an Excel workbook from `master` and `weekly_summary` which may be
-    file paths or DataFrames. Writes the Excel workbook to `output_path`.
+    `df` with those of `cols` it has coerced to numbers (unparseable values
+    become NaN), in one `to_numeric` pass per column. Currency text such as
+    "$1,234.50" is read as the number. Columns that already have a numeric
+    dtype (the usual case for frames from the pipeline) are left alone, and
+    `df` itself is returned when nothing needs coercing.
     """
-    # ---- LOAD DATA ----
-    if isinstance(master, pd.DataFrame):
-        master_df = master.copy()
-    else:
-        master_df = pd.read_csv(master)
+    cols = [
+        col for col in cols
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col])
+    ]
+    if not cols:
+        return df
+    coerced = df[cols].apply(_to_number)
+    return df.assign(**{col: coerced[col] for col in cols})
 
-    if isinstance(weekly_summary, pd.DataFrame):
-        summary_raw = weekly_summary.copy()
-    else:
-        summary_raw = pd.read_csv(weekly_summary)
 
-    if summary_raw.empty:
-        raise ValueError("weekly_summary.csv is empty – run your summary script first.")
+def _to_number(values):
+    try:
+        # Drop '$' and thousands separators from the text entries only
+        stripped = values.str.replace(r"[$,]", "", regex=True)
+        values = stripped.where(stripped.notna(), values)
+    except AttributeError:
+        # no text in the Series
+        pass
+    return pd.to_numeric(values, errors="coerce")
+
 
-    s = summary_raw.iloc[0].copy()
-
-    # ---- ENSURE MASTER NUMERIC COLUMNS ----
-    for col in ["subtotal", "discount", "shipping", "tax", "bar_cogs", "total_shipping_cost", "total_bars_sold"]:
-        if col in master_df.columns:
-            master_df[col] = pd.to_numeric(master_df[col], errors="coerce")
-
-    # ---- ENSURE SUMMARY NUMERIC COLUMNS ----
-    num_cols = [
-        "Gross_Revenue",  # may or may not be used
-        "Taxes_Collected",
-        "COGS_Total",
-        "Shipping_Costs_Total",
-        "Shipping_Costs_Orders",
-        "Receiving_Sum",
-        "Payment_Processing_Fee",
-        "Gross_Profit",
-        "Gross_Margin",
-        "Starting_Inventory_Bars",
-        "Boxes_Sold_This_Week",
-        "Bars_Sold_This_Week",
-        "Total_Inventory_Sold_Bars",
-        "Weekly_Ending_Inventory_Bars",
+def read_numeric_csv(path, numeric_cols):
+    """
+    Read a pipeline CSV with `numeric_cols` typed as float64 by the parser,
+    so they need no coercion afterwards. Uses pandas' multithreaded
+    `pyarrow` CSV engine when pyarrow is installed, else the default C
+    parser. If one of the columns holds text, the file is re-read untyped
+    and coerced with `coerce_numeric`.
+    """
+    dtype = {col: "float64" for col in numeric_cols}
+    try:
+        try:
+            return pd.read_csv(path, engine="pyarrow", dtype=dtype)
+        except ImportError:
+            return pd.read_csv(path, dtype=dtype)
+    except ValueError:
+        return coerce_numeric(pd.read_csv(path), numeric_cols)
+
+
+def arrow_strings(df):
+    """
+    `df` with its text-only object columns stored as pyarrow-backed strings
+    (compact, and `.str` methods run in Arrow kernels). Columns mixing text
+    with other values (e.g. datetimes) are left as they are, and so is
+    everything when pyarrow is not installed.
+    """
+    try:
+        dtype = pd.StringDtype("pyarrow")
+    except ImportError:
+        return df
+    text_cols = [
+        col for col, col_dtype in df.dtypes.items()
+        if col_dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) in ("string", "empty")
     ]
-    for col in num_cols:
-        if col in summary_raw.columns:
-            s[col] = pd.to_numeric(s[col], errors="coerce")
+    if not text_cols:
+        return df
+    return df.astype({col: dtype for col in text_cols})
+
+
+def naive_datetimes(df):
+    """
+    `df` with its timezone-aware datetime columns converted to naive wall
+    time (the clock time shown in their own timezone), since Excel cells
+    carry no timezone. `df` itself is returned when there are none.
+    """
+    aware = [col for col, dtype in df.dtypes.items() if isinstance(dtype, pd.DatetimeTZDtype)]
+    if not aware:
+        return df
+    return df.assign(**{col: df[col].dt.tz_localize(None) for col in aware})
+
+
+def sales_team_mask(df):
+    """
+    Boolean array marking the rows sent to the sales team: `email` is
+    'SENT TO SALES TEAM' or `source`/`sources` is 'sales_team' (compared
+    case-insensitively, ignoring surrounding whitespace). Each column that is
+    present is normalized once; missing values never match.
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    for col, upper, sales_value in (
+        ("email", True, "SENT TO SALES TEAM"),
+        ("source", False, "sales_team"),
+        ("sources", False, "sales_team"),
+    ):
+        if col in df.columns:
+            text = df[col].astype("string").str.strip()
+            text = text.str.upper() if upper else text.str.lower()
+            mask |= text.eq(sales_value).fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+def _as_int(value, default=0):
+    """
+    `value` as an int, or `default` when it is missing (None / NaN / blank
+    text) or not a number.
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return default
+    if isinstance(value, str) and not value.strip():
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return default
+
+
+def sheet_rows(df):
+    """
+    Header, then one tuple per row of `df` (lazily), as `to_excel` would
+    write them: native Python values, with missing values left blank (None).
+    """
+    yield tuple(df.columns)
+    values = df.astype(object).where(df.notna(), None)
+    yield from values.itertuples(index=False, name=None)
+
+
+def summary_table_rows(rows):
+    """
+    Financial Summary rows as (Metric, Value, Note, number format) tuples
+    ready to write. Rows are built as [metric, value, note, number format]
+    with the trailing entries optional. Labels are escaped with
+    `escape_excel_formula`, and missing values (None / NaN) are left blank
+    (None) and unformatted.
+    """
+    table = []
+    for metric, value, *rest in rows:
+        note = rest[0] if rest else None
+        number_format = rest[1] if len(rest) > 1 else None
+        metric, value, note = (None if pd.isna(v) else v for v in (escape_excel_formula(metric), value, note))
+        if value is None or value == "":
+            number_format = None
+        table.append((metric, value, note, number_format))
+    return table
+
+
+def row_widths(header, rows):
+    """
+    `column_widths` for a header and a list of row tuples (blank cells are
+    None), for tables too small to be worth a DataFrame. Entries past the
+    header are ignored.
+    """
+    widths = [len(str(h)) for h in header]
+    for row in rows:
+        for i, v in enumerate(row[:len(header)]):
+            if v is not None:
+                widths[i] = max(widths[i], len(str(v)))
+    return widths
+
+
+def column_widths(df):
+    """
+    Length of the longest str() of the header or any non-missing value in
+    each column of `df`, one vectorized pass per column.
+    """
+    widths = df.columns.astype(str).str.len().to_numpy(dtype=int, copy=True)
+    for i, (_, col) in enumerate(df.items()):
+        col = col.dropna()
+        if col.empty:
+            continue
+        # astype(str) drops the time from midnight-only datetimes, so those
+        # go through str() like the cell values do
+        text = col.map(str) if col.dtype.kind == "M" else col.astype(str)
+        widths[i] = max(widths[i], text.str.len().max())
+    return widths
+
+
+def compute_report_metrics(master_df, summary_raw):
+    """
+    The period's financial and inventory figures, recalculated from the
+    (numeric-coerced, non-empty) weekly summary, with the Master Log as the
+    fallback for COGS. Returns a dict keyed by metric name; no Excel
+    involved, so it can be called (and checked) on its own.
+    """
+    s = summary_raw.iloc[0]
 
     # ======================================================
     #           RE-CALCULATE KEY FINANCIALS
     # ======================================================
 
+    # One reduction over the summary for all three collected amounts:
     # Revenue (product only, net of discounts, EXCLUDING shipping)
-    # Formula: sum(subtotal - discount)
-    revenue_product = (summary_raw["Gross_Revenue"]).sum(skipna=True)
-
+    #     Formula: sum(subtotal - discount)
     # Shipping collected from customers (Shopify "shipping" column)
-    shipping_collected = summary_raw["Shipping_Collected"].sum(skipna=True)
+    # Taxes collected
+    collected = summary_raw[["Gross_Revenue", "Shipping_Collected", "Taxes_Collected"]].to_numpy(dtype=float)
+    revenue_product, shipping_collected, taxes_collected = np.nansum(collected, axis=0)
 
     # Gross Revenue = product revenue + shipping collected
     gross_revenue = revenue_product + shipping_collected
 
-    # Taxes collected
-    # Use master to stay consistent with actual orders
-    taxes_collected = summary_raw["Taxes_Collected"].sum(skipna=True)
-
     # COGS total – use summary (already sum of bar_cogs)
     if "COGS_Total" in s.index and not pd.isna(s["COGS_Total"]):
         cogs_total = float(s["COGS_Total"])
@@ -149,13 +307,62 @@ def build_weekly_workbook(
     # ======================================================
 
     starting_inventory = int(s.get("Starting_Inventory_Bars", 0) or 0)
-    
     cases_sold = int(s.get("Cases_Sold_This_Week", 0) or 0)
     boxes_sold = int(s.get("Boxes_Sold_This_Week", 0) or 0)
     bars_sold = int(s.get("Bars_Sold_This_Week", 0) or 0)
     total_inventory_sold = int(s.get("Total_Inventory_Sold_Bars", 0) or 0)
     weekly_ending_inventory = int(s.get("Weekly_Ending_Inventory_Bars", 0) or 0)
 
+    return {
+        "revenue_product": revenue_product,
+        "shipping_collected": shipping_collected,
+        "gross_revenue": gross_revenue,
+        "taxes_collected": taxes_collected,
+        "cogs_total": cogs_total,
+        "total_3pl_costs": total_3pl_costs,
+        "gross_profit": gross_profit,
+        "gross_margin": gross_margin,
+        "starting_inventory": starting_inventory,
+        "cases_sold": cases_sold,
+        "boxes_sold": boxes_sold,
+        "bars_sold": bars_sold,
+        "total_inventory_sold": total_inventory_sold,
+        "weekly_ending_inventory": weekly_ending_inventory,
+    }
+
+
+def build_weekly_workbook(
+    master,
+    weekly_summary,
+    output_path="Skye_Weekly_Report.xlsx",
+    pos_bars=None,
+    tot_pos_bars=None,
+):
+    """
+    Build an Excel workbook from `master` and `weekly_summary` which may be
+    file paths or DataFrames. Writes the Excel workbook to `output_path`.
+    """
+    # ---- LOAD DATA (NUMERIC COLUMNS ENSURED) ----
+    # CSVs are read with the numeric columns already typed. DataFrames are
+    # used as given (no defensive copy) and coerced into a new frame.
+    if isinstance(master, pd.DataFrame):
+        master_df = coerce_numeric(master, MASTER_NUMERIC_COLS)
+    else:
+        master_df = read_numeric_csv(master, MASTER_NUMERIC_COLS)
+    # Text columns go to Arrow strings once; the sales-team mask and the
+    # workbook writer below both use this frame
+    master_df = arrow_strings(master_df)
+
+    if isinstance(weekly_summary, pd.DataFrame):
+        summary_raw = coerce_numeric(weekly_summary, SUMMARY_NUMERIC_COLS)
+    else:
+        summary_raw = read_numeric_csv(weekly_summary, SUMMARY_NUMERIC_COLS)
+
+    if summary_raw.empty:
+        raise ValueError("weekly_summary.csv is empty – run your summary script first.")
+
+    metrics = compute_report_metrics(master_df, summary_raw)
+
     # ======================================================
     #           BUILD PRETTY SUMMARY TABLE
     # ======================================================
@@ -164,93 +371,86 @@ def build_weekly_workbook(
 
     # Header
     rows.append([
-        escape_excel_formula("============== Cumulative Period Financials ====================="),
+        "============== Cumulative Period Financials =====================",
         ""
     ])
 
     # Revenue structure
     # Use numeric types for values so Excel stores real numbers and can be formatted
-    rows.append([escape_excel_formula("Revenue"), revenue_product])
-    rows.append([escape_excel_formula("+ Shipping collected"), shipping_collected])
-    rows.append([escape_excel_formula("------------------------------------------------------"), ""])
-    rows.append([escape_excel_formula("Gross Revenue"), gross_revenue])
+    rows.append(["Revenue", metrics["revenue_product"], None, CURRENCY_FORMAT])
+    rows.append(["+ Shipping collected", metrics["shipping_collected"], None, CURRENCY_FORMAT])
+    rows.append([SEPARATOR_THIN, ""])
+    rows.append(["Gross Revenue", metrics["gross_revenue"], None, CURRENCY_FORMAT])
 
     # Taxes
-    rows.append([escape_excel_formula("+ Taxes Collected"), taxes_collected])
+    rows.append(["+ Taxes Collected", metrics["taxes_collected"], None, CURRENCY_FORMAT])
 
     # COGS & 3PL
     # Store subtractive amounts as negative numbers so Excel can format them
     try:
-        cogs_value = -abs(float(cogs_total)) if not pd.isna(cogs_total) else np.nan
+        cogs_value = -abs(float(metrics["cogs_total"])) if not pd.isna(metrics["cogs_total"]) else np.nan
     except Exception:
-        cogs_value = -abs(cogs_total) if cogs_total is not None else np.nan
+        cogs_value = -abs(metrics["cogs_total"]) if metrics["cogs_total"] is not None else np.nan
 
     try:
-        total_3pl_value = -abs(float(total_3pl_costs)) if not pd.isna(total_3pl_costs) else np.nan
+        total_3pl_value = -abs(float(metrics["total_3pl_costs"])) if not pd.isna(metrics["total_3pl_costs"]) else np.nan
     except Exception:
-        total_3pl_value = -abs(total_3pl_costs) if total_3pl_costs is not None else np.nan
+        total_3pl_value = -abs(metrics["total_3pl_costs"]) if metrics["total_3pl_costs"] is not None else np.nan
 
-    rows.append([escape_excel_formula("- COGS"), cogs_value])
+    rows.append(["- COGS", cogs_value, None, CURRENCY_FORMAT])
     rows.append([
-        escape_excel_formula("- Total 3PL Costs (shipping, receiving, payment processing fee)"),
-        total_3pl_value, "For for next period processing fee, lookup in pdf invoice"
+        "- Total 3PL Costs (shipping, receiving, payment processing fee)",
+        total_3pl_value, "For for next period processing fee, lookup in pdf invoice", CURRENCY_FORMAT,
     ])
-    rows.append([escape_excel_formula("------------------------------------------------------"), ""])
+    rows.append([SEPARATOR_THIN, ""])
 
     # Gross Profit & Margin
-    rows.append([escape_excel_formula("Gross Profit"), gross_profit])
-    if not np.isnan(gross_margin):
+    rows.append(["Gross Profit", metrics["gross_profit"], None, CURRENCY_FORMAT])
+    if not np.isnan(metrics["gross_margin"]):
         # store as a fraction (e.g., 0.25 for 25%) so Excel percent formatting works
-        rows.append([escape_excel_formula("Gross Margin"), gross_margin])
+        rows.append(["Gross Margin", metrics["gross_margin"], None, PERCENT_FORMAT])
     else:
-        rows.append([escape_excel_formula("Gross Margin"), "N/A"])
+        rows.append(["Gross Margin", "N/A", None, PERCENT_FORMAT])
 
     # Spacer
     rows.append(["", ""])
 
     # Inventory header
-    rows.append([escape_excel_formula("===============Inventory / Units======================="), ""])
+    rows.append(["===============Inventory / Units=======================", ""])
 
     # Inventory details (store as integers so Excel keeps numeric types)
 
-    rows.append([escape_excel_formula("Starting Inventory (bars)"), starting_inventory, ""])
+    rows.append(["Starting Inventory (bars)", metrics["starting_inventory"], "", COUNT_FORMAT])
 
     # Insert a row of '=' signs and a blank row before Boxes Sold
-    rows.append([escape_excel_formula("======================================================"), "", ""])
+    rows.append([SEPARATOR_THICK, "", ""])
     rows.append(["", "", ""])
 
-    rows.append([escape_excel_formula("Cases Sold/Sent Out This Period"), cases_sold, ""])
-    rows.append([escape_excel_formula("Boxes Sold/Sent Out This Period"), boxes_sold, ""])
-    rows.append([escape_excel_formula("Single Bars Sold/Sent Out This Period"), bars_sold, ""])
+    rows.append(["Cases Sold/Sent Out This Period", metrics["cases_sold"], "", COUNT_FORMAT])
+    rows.append(["Boxes Sold/Sent Out This Period", metrics["boxes_sold"], "", COUNT_FORMAT])
+    rows.append(["Single Bars Sold/Sent Out This Period", metrics["bars_sold"], "", COUNT_FORMAT])
     
     
     # separator (visual)
     rows.append(["","",""])
-    rows.append([escape_excel_formula("------------------------------------------------------"), "", ""])
+    rows.append([SEPARATOR_THIN, "", ""])
 
 
     # --- Concise double-check for cases, boxes, bars ---
-    def get_mask(item):
-        return (master_df.get("box_or_bar_or_case") == item)
-
-    def not_sales_mask():
-        email_col = master_df["email"].astype(str).str.strip().str.upper() if "email" in master_df.columns else ""
-        source_col = master_df["source"].astype(str).str.strip().str.lower() if "source" in master_df.columns else ""
-        sources_col = master_df["sources"].astype(str).str.strip().str.lower() if "sources" in master_df.columns else ""
-        return (
-            (email_col != "SENT TO SALES TEAM") & (source_col != "sales_team") & (sources_col != "sales_team")
-        )
-
     # Bars per unit
     bars_per_case = 168
     bars_per_box = 7
     bars_per_single = 1
 
-    # Master log counts
-    mask = not_sales_mask()
-    master_case_qty = int(pd.to_numeric(master_df.loc[get_mask("case") & mask, "line_item_quantity"], errors="coerce").sum(skipna=True) or 0)
-    master_box_qty = int(pd.to_numeric(master_df.loc[get_mask("box") & mask, "line_item_quantity"], errors="coerce").sum(skipna=True) or 0)
-    master_bar_qty = int(pd.to_numeric(master_df.loc[get_mask("bar") & mask, "line_item_quantity"], errors="coerce").sum(skipna=True) or 0)
+    # Master log counts: quantities parsed once, summed per item type in one groupby
+    qty = pd.to_numeric(master_df["line_item_quantity"], errors="coerce")
+    if "box_or_bar_or_case" in master_df.columns:
+        qty_by_type = qty.mask(sales_team_mask(master_df)).groupby(master_df["box_or_bar_or_case"], observed=True).sum()
+    else:
+        qty_by_type = pd.Series(dtype=float)
+    master_case_qty = int(qty_by_type.get("case", 0) or 0)
+    master_box_qty = int(qty_by_type.get("box", 0) or 0)
+    master_bar_qty = int(qty_by_type.get("bar", 0) or 0)
 
     # Derived bars from master log
     master_case_bars = master_case_qty * bars_per_case
@@ -258,192 +458,260 @@ def build_weekly_workbook(
     master_bar_bars = master_bar_qty * bars_per_single
 
     # Derived bars from summary
-    cases_sold_summary = int(s.get("Cases_Sold_This_Week", 0) or 0)
-    boxes_sold_summary = int(s.get("Boxes_Sold_This_Week", 0) or 0)
-    bars_sold_summary = int(s.get("Bars_Sold_This_Week", 0) or 0)
-    summary_case_bars = cases_sold_summary * bars_per_case
-    summary_box_bars = boxes_sold_summary * bars_per_box
-    summary_bar_bars = bars_sold_summary * bars_per_single
+    summary_case_bars = metrics["cases_sold"] * bars_per_case
+    summary_box_bars = metrics["boxes_sold"] * bars_per_box
+    summary_bar_bars = metrics["bars_sold"] * bars_per_single
 
     # Notes for mismatches
     note_case = f"Mismatch: master-derived bars={master_case_bars}" if master_case_bars != summary_case_bars else ""
     note_box = f"Mismatch: master-derived bars={master_box_bars}" if master_box_bars != summary_box_bars else ""
     note_bar = f"Mismatch: master-derived bars={master_bar_bars}" if master_bar_bars != summary_bar_bars else ""
 
-    rows.append([escape_excel_formula("Case Bars Sold/Sent Out (case * 168 bars)"), summary_case_bars, note_case])
-    rows.append([escape_excel_formula("+ Box Bars Sold/Sent Out (box * 7 bars)"), summary_box_bars, note_box])
-    rows.append([escape_excel_formula("+ Single Bars Sold/Sent Out (single * 1 bar)"), summary_bar_bars, note_bar])
+    rows.append(["Case Bars Sold/Sent Out (case * 168 bars)", summary_case_bars, note_case, COUNT_FORMAT])
+    rows.append(["+ Box Bars Sold/Sent Out (box * 7 bars)", summary_box_bars, note_box, COUNT_FORMAT])
+    rows.append(["+ Single Bars Sold/Sent Out (single * 1 bar)", summary_bar_bars, note_bar, COUNT_FORMAT])
 
     # Add a row of dashes between single bars sold and total inventory sold
-    rows.append([escape_excel_formula("------------------------------------------------------"), "", ""])
+    rows.append([SEPARATOR_THIN, "", ""])
 
-    rows.append([escape_excel_formula("Total Inventory Sold (bars)"), total_inventory_sold, ""])
+    rows.append(["Total Inventory Sold (bars)", metrics["total_inventory_sold"], "", COUNT_FORMAT])
 
     # Insert three blank rows, then a compact inventory summary block
 
-    rows.append([escape_excel_formula("======================================================"), "", ""])
+    rows.append([SEPARATOR_THICK, "", ""])
     rows.append(["", "", ""])  # blank
 
-    rows.append([escape_excel_formula("Starting Inventory (bars)"), starting_inventory, ""])
+    rows.append(["Starting Inventory (bars)", metrics["starting_inventory"], "", COUNT_FORMAT])
     # Show total inventory sold as a subtractive value in the compact summary
     try:
-        total_inventory_sold_value = -abs(int(total_inventory_sold))
+        total_inventory_sold_value = -abs(int(metrics["total_inventory_sold"]))
     except Exception:
-        total_inventory_sold_value = -abs(total_inventory_sold) if total_inventory_sold is not None else np.nan
-
-    rows.append([escape_excel_formula("- Total Inventory Sold (bars)"), total_inventory_sold_value, ""])
-    rows.append([escape_excel_formula("------------------------------------------------------"), "", ""])
-    rows.append([escape_excel_formula("Ending Inventory (bars)"), weekly_ending_inventory, "Use this in next period Starting Inventory"])
+        total_inventory_sold_value = -abs(metrics["total_inventory_sold"]) if metrics["total_inventory_sold"] is not None else np.nan
 
+    rows.append(["- Total Inventory Sold (bars)", total_inventory_sold_value, "", COUNT_FORMAT])
+    rows.append([SEPARATOR_THIN, "", ""])
+    rows.append(["Ending Inventory (bars)", metrics["weekly_ending_inventory"], "Use this in next period Starting Inventory", COUNT_FORMAT])
 
-    # Add a third column for optional notes/comments (e.g., mismatches)
-    summary_pretty = pd.DataFrame(rows, columns=["Metric", "Value", "Note"])
 
     # ---- POS / 3PL Remaining Bars ----
     # Determine POS bars value: if caller provided `pos_bars` use it,
     # otherwise prompt the user when running interactively.
-    try:
-        if pos_bars is None:
-            user_input = input("Enter Bars to be sold (POS) (integer, 0 if none): ")
-            pos_bars_val = int(user_input.strip()) if str(user_input).strip() != "" else 0
-        else:
-            pos_bars_val = int(pos_bars)
-    except Exception:
-        pos_bars_val = 0
+    if pos_bars is None:
+        pos_bars = input("Enter Bars to be sold (POS) (integer, 0 if none): ")
+    pos_bars_val = _as_int(pos_bars)
 
     # Add GTM / sales-team sendout bars into the POS bars count so they
     # are available to be subtracted by the POS calculation but still
     # remain tracked in the master log (use `exclude_from_bars_sold`).
     gtm_bars = 0
     if "exclude_from_bars_sold" in master_df.columns and "total_bars_sold" in master_df.columns:
-        try:
-            gtm_bars = int(master_df.loc[master_df["exclude_from_bars_sold"] == True, "total_bars_sold"].sum(skipna=True) or 0)
-        except Exception:
-            try:
-                gtm_bars = int((master_df.loc[master_df["exclude_from_bars_sold"] == True, "total_bars_sold"].sum(skipna=True)))
-            except Exception:
-                gtm_bars = 0
+        # The flag is a plain bool column from the master log builder; other
+        # dtypes (e.g. blanks read from CSV) only count rows that are True
+        excluded = master_df["exclude_from_bars_sold"]
+        excluded = excluded.to_numpy() if excluded.dtype == bool else (excluded == True).fillna(False).to_numpy(dtype=bool)
+        gtm_bars = _as_int(np.nansum(master_df["total_bars_sold"].to_numpy(dtype=float)[excluded]))
 
-    try:
-        pos_bars_val = int(pos_bars_val) + int(gtm_bars)
-    except Exception:
-        pass
+    pos_bars_val += gtm_bars
 
-    
-    
     # Bars sent total for POS = total sent to sales team + newly sent out gtm bars
-    try:
-        tot_for_pos = int(tot_pos_bars) + int(gtm_bars)
-    except Exception:
-        tot_pos_bars = 0
-    
-    # Bars left for POS = pos_bars - single bars sold (per request)  
-    try:
-        bars_left_for_pos = int(pos_bars_val) - int(bars_sold)
-    except Exception:
-        bars_left_for_pos = 0
+    # (no total given counts as 0)
+    tot_for_pos = _as_int(tot_pos_bars) + gtm_bars
+
+    # Bars left for POS = pos_bars - single bars sold (per request)
+    bars_left_for_pos = pos_bars_val - metrics["bars_sold"]
 
     # Bars left at 3PL = ending inventory - bars_left_for_pos
-    try:
-        bars_left_at_3pl = int(weekly_ending_inventory) - int(tot_for_pos)
-    except Exception:
-        bars_left_at_3pl = 0
+    bars_left_at_3pl = metrics["weekly_ending_inventory"] - tot_for_pos
 
     pos_note = ""
     if bars_left_at_3pl < 0:
         pos_note = f"Negative at 3PL: {bars_left_at_3pl}"
 
-    # Append POS rows to the DataFrame so they appear in the Financial Summary
+    # Append POS rows so they appear in the Financial Summary
     extra_rows = [
-        [escape_excel_formula("======================================================"), "", ""],
+        [SEPARATOR_THICK, "", ""],
         ["", "", ""],
-        [escape_excel_formula("=============== POS / Remaining Inventory ============"), "", ""],
-        [escape_excel_formula("Total POS Bars that were given to sales members"), tot_for_pos, "Use this for POS sent to sales members"],
+        ["=============== POS / Remaining Inventory ============", "", ""],
+        ["Total POS Bars that were given to sales members", tot_for_pos, "Use this for POS sent to sales members", COUNT_FORMAT],
         ["" ,"" ,""],
-        [escape_excel_formula("Bars to be sold (POS)"), pos_bars_val, ""],
-        [escape_excel_formula("- Single Bars Sold/Sent Out"), bars_sold, ""],
-        [escape_excel_formula("------------------------------------------------------"), "", ""],
-        [escape_excel_formula("Bars outstanding (POS)"), bars_left_for_pos, "Use this in next period POS bars"],
-        [escape_excel_formula("======================================================"), "", ""],
+        ["Bars to be sold (POS)", pos_bars_val, "", COUNT_FORMAT],
+        ["- Single Bars Sold/Sent Out", metrics["bars_sold"], "", COUNT_FORMAT],
+        [SEPARATOR_THIN, "", ""],
+        ["Bars outstanding (POS)", bars_left_for_pos, "Use this in next period POS bars", COUNT_FORMAT],
+        [SEPARATOR_THICK, "", ""],
         ["", "", ""],
-        [escape_excel_formula("Ending Inventory (bars)"), weekly_ending_inventory],
-        [escape_excel_formula("- Bars given out to Sales Members"), -abs(tot_for_pos), ""],
-        [escape_excel_formula("------------------------------------------------------"), "", ""],
-        [escape_excel_formula("Bars left at 3PL"), bars_left_at_3pl, pos_note],
+        ["Ending Inventory (bars)", metrics["weekly_ending_inventory"], None, COUNT_FORMAT],
+        ["- Bars given out to Sales Members", -abs(tot_for_pos), "", COUNT_FORMAT],
+        [SEPARATOR_THIN, "", ""],
+        ["Bars left at 3PL", bars_left_at_3pl, pos_note, COUNT_FORMAT],
     ]
 
-    # concat extra rows onto summary_pretty
-    if not extra_rows:
-        pass
-    else:
-        extra_df = pd.DataFrame(extra_rows, columns=["Metric", "Value", "Note"])
-        summary_pretty = pd.concat([summary_pretty, extra_df], ignore_index=True)
+    rows.extend(extra_rows)
+
+    # Rows go to the writer as plain tuples (a third column holds optional
+    # notes, e.g. mismatches, and each row carries its number format).
+    # Labels starting with '=', '+' or '-' are escaped so Excel does not read
+    # them as formulas.
+    summary_rows = summary_table_rows(rows)
 
     # ======================================================
     #                WRITE EXCEL WITH TWO TABS
     # ======================================================
 
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        # Tab 1: master log table
+    writer = write_report_workbook(output_path, master_df, summary_rows)
+    print(f"Workbook written to: {output_path} ({writer})")
+
+
+def write_report_workbook(output_path, master_df, summary_rows):
+    """
+    Write the `Master Log` and `Financial Summary` tabs to `output_path`;
+    `summary_rows` are (Metric, Value, Note, number format) tuples (see
+    `summary_table_rows`). Returns which writer was used, with the reason
+    when jetxl was skipped.
+    Uses the Rust-backed `jetxl` writer (pip install jetxl) when it and
+    pyarrow are installed and the data fits Arrow columns. Otherwise
+    pandas `to_excel` writes it, through xlsxwriter when installed, else
+    openpyxl.
+
+    Timezone-aware datetimes are written as wall time on both paths (see
+    `naive_datetimes`).
+    """
+    master_df = naive_datetimes(master_df)
+    widths = report_column_widths(master_df, summary_rows)
+    try:
+        import jetxl
+        import pyarrow as pa
+    except ImportError:
+        skipped = "jetxl/pyarrow not installed"
+    else:
+        skipped = _write_jetxl(jetxl, pa, output_path, master_df, summary_rows, widths)
+        if skipped is None:
+            return "jetxl"
+    engine = _write_excel_writer(output_path, master_df, summary_rows, widths)
+    return f"{engine}; {skipped}"
+
+
+def report_column_widths(master_df, summary_rows):
+    """
+    Column widths (longest value plus 2) for each sheet, keyed by sheet name;
+    both writers use them.
+    """
+    return {
+        "Master Log": [int(w) + 2 for w in column_widths(master_df)],
+        "Financial Summary": [int(w) + 2 for w in row_widths(SUMMARY_HEADER, summary_rows)],
+    }
+
+
+def _write_jetxl(jetxl, pa, output_path, master_df, summary_rows, widths):
+    """
+    Write the workbook with `jetxl` from Arrow tables. Returns None once
+    written, else why the data can't be typed as Arrow columns (nothing is
+    written): a text Summary value such as "N/A", a Master Log column
+    mixing types, or timezone-aware timestamps left in object columns,
+    which jetxl would write as UTC rather than wall time.
+    """
+    # Blank ("") values are written as empty cells either way
+    values = [None if value == "" else value for _, value, _, _ in summary_rows]
+    if any(isinstance(value, str) for value in values):
+        return "jetxl skipped: text Summary value"
+    try:
+        master_table = pa.Table.from_pandas(master_df, preserve_index=False)
+        summary_table = pa.table({
+            "Metric": pa.array([metric for metric, *_ in summary_rows], type=pa.string()),
+            "Value": pa.array(values, type=pa.float64()),
+            "Note": pa.array([note for _, _, note, _ in summary_rows], type=pa.string()),
+        })
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        return f"jetxl skipped: {e}"
+    if any(pa.types.is_timestamp(field.type) and field.type.tz for field in master_table.schema):
+        return "jetxl skipped: timezone-aware timestamps"
+
+    def named(names, sheet_widths):
+        return {str(name): float(w) for name, w in zip(names, sheet_widths)}
+
+    jetxl.write_sheets_arrow([
+        {
+            "data": master_table,
+            "name": "Master Log",
+            "column_widths": named(master_df.columns, widths["Master Log"]),
+        },
+        {
+            "data": summary_table,
+            "name": "Financial Summary",
+            "column_widths": named(SUMMARY_HEADER, widths["Financial Summary"]),
+            # Number formats per value cell (rows are 1-based under the header, columns 0-based)
+            "cell_styles": [
+                {"row": r, "col": 1, "number_format": number_format}
+                for r, (*_, number_format) in enumerate(summary_rows, start=2)
+                if number_format is not None
+            ],
+        },
+    ], os.fspath(output_path), os.cpu_count() or 1)
+    return None
+
+
+def _excel_writer(output_path):
+    """
+    pd.ExcelWriter on xlsxwriter (pip install xlsxwriter), falling back to
+    openpyxl when it isn't installed. Text is written as text, never as a
+    formula or URL, and datetimes use `DATE_FORMAT`.
+    """
+    try:
+        return pd.ExcelWriter(
+            output_path,
+            engine="xlsxwriter",
+            datetime_format=DATE_FORMAT,
+            engine_kwargs={"options": {"strings_to_formulas": False, "strings_to_urls": False, "nan_inf_to_errors": True}},
+        )
+    except ImportError:
+        return pd.ExcelWriter(output_path, engine="openpyxl", datetime_format=DATE_FORMAT)
+
+
+def _write_excel_writer(output_path, master_df, summary_rows, widths):
+    """
+    Write the workbook with pandas `to_excel` (see `_excel_writer`) and
+    return the engine used.
+    """
+    summary_df = pd.DataFrame([row[:3] for row in summary_rows], columns=list(SUMMARY_HEADER))
+
+    with _excel_writer(output_path) as writer:
         master_df.to_excel(writer, sheet_name="Master Log", index=False)
-    
-    # Tab 2: Financial & Inventory Summary
-        summary_pretty.to_excel(writer, sheet_name="Financial Summary", index=False)
-
-        wb = writer.book
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            autosize_columns(ws)
-
-        # Apply number formats to Financial Summary so values are stored as numbers
-        if "Financial Summary" in wb.sheetnames:
-            ws_summary = wb["Financial Summary"]
-            # DataFrame wrote headers in row 1; data starts at row 2
-            for row in ws_summary.iter_rows(min_row=2, min_col=1, max_col=3):
-                metric_cell = row[0]
-                value_cell = row[1]
-                note_cell = row[2] if len(row) > 2 else None
-                metric_text = str(metric_cell.value or "").lower()
-                # Skip empty values and separators
-                if value_cell.value is None or value_cell.value == "":
-                    continue
-
-                # Determine if this metric is subtractive (label starts with '-')
-                is_subtractive = metric_text.strip().startswith("-")
-
-                # Percentages (Gross Margin)
-                if "margin" in metric_text:
-                    try:
-                        # Expecting a fraction (e.g., 0.25) -> display as percent
-                        if is_subtractive:
-                            value_cell.number_format = '0.00%;(0.00%)'
-                        else:
-                            value_cell.number_format = '0.00%'
-                    except Exception:
-                        pass
-                # Currency-like values
-                # avoid matching bare '3pl' so inventory labels like 'Bars left at 3PL'
-                # are not treated as currency; match cost-related terms instead
-                elif any(k in metric_text for k in ["revenue", "tax", "cogs", "shipping", "profit", "cost", "payment processing fee"]):
-                    try:
-                        # Use accounting-style formatting when subtractive so negatives show parentheses
-                        if is_subtractive:
-                            value_cell.number_format = '"$"#,##0.00;(\"$\"#,##0.00)'
-                        else:
-                            value_cell.number_format = '"$"#,##0.00'
-                    except Exception:
-                        pass
-                # Integer counts (inventory / units)
-                elif any(k in metric_text for k in ["inventory", "bars", "boxes", "sold", "starting inventory", "ending inventory", "total inventory"]):
-                    try:
-                        if is_subtractive:
-                            value_cell.number_format = '#,##0;(#,##0)'
-                        else:
-                            value_cell.number_format = '#,##0'
-                    except Exception:
-                        pass
-
-        print(f"Workbook written to: {output_path}")
+        summary_df.to_excel(writer, sheet_name="Financial Summary", index=False)
+
+        # Number formats for the Value cells (rows are 1-based under the header)
+        ws = writer.sheets["Financial Summary"]
+        formatted = [
+            (r, value, number_format)
+            for r, (_, value, _, number_format) in enumerate(summary_rows, start=1)
+            if number_format is not None
+        ]
+        if writer.engine == "xlsxwriter":
+            # xlsxwriter can't restyle written cells, so they are re-written
+            # with one shared format per number format
+            formats = {}
+            for r, value, number_format in formatted:
+                if number_format not in formats:
+                    formats[number_format] = writer.book.add_format({"num_format": number_format})
+                ws.write(r, 1, value, formats[number_format])
+        else:
+            for r, _, number_format in formatted:
+                ws.cell(row=r + 1, column=2).number_format = number_format
+            # openpyxl stores text starting with "=" as a formula; keep it text
+            # as the other writers do
+            ws = writer.sheets["Master Log"]
+            for j, (_, col) in enumerate(master_df.items(), start=1):
+                if col.dtype == object or isinstance(col.dtype, pd.StringDtype):
+                    for i in np.flatnonzero(col.map(lambda v: isinstance(v, str) and v.startswith("="))):
+                        ws.cell(row=i + 2, column=j).data_type = "s"
+
+        for sheet_name, sheet_widths in widths.items():
+            ws = writer.sheets[sheet_name]
+            for i, w in enumerate(sheet_widths):
+                if writer.engine == "xlsxwriter":
+                    ws.set_column(i, i, w)
+                else:
+                    ws.column_dimensions[get_column_letter(i + 1)].width = w
+        return writer.engine
 
 
 # Runner for testing
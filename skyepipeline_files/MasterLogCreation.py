@@ -3,6 +3,21 @@ import pandas as pd
 import numpy as np
 import re
 from pathlib import Path
+from skyepipeline_files.SkyeHelpers import (
+    PER_BAR_COGS,
+    ITEM_TYPES,
+    BARS_PER_UNIT,
+    classify_shopify_item,
+    compute_bars_sold,
+    compute_bar_cogs,
+    compute_bars_sold_from_codes,
+    compute_bar_cogs_from_codes,
+    shopify_item_codes,
+    compute_total_shipping_vec,
+    read_threepl_excel,
+    read_orders_csv,
+    write_csv,
+)
 
 """
 MasterLogCreation.py
@@ -28,103 +43,94 @@ Key operations performed:
      write CSV or Excel to `output_path` when provided.
 
 Notes:
- - Uses the module-level constant `PER_BAR_COGS` to compute per-row COGS.
+ - Classification, COGS (`PER_BAR_COGS`), shipping and read/write helpers
+     live in `SkyeHelpers.py` and are re-exported here.
  - Excel writing requires `openpyxl` when using `.xlsx` output paths.
+ - The 3PL workbook is read with `python-calamine` when installed (much
+     faster than openpyxl); otherwise pandas' default reader is used.
 """
 
 # ---- CONSTANTS ----
-# Per-bar COGS from: 39,891.91 / 15,848
-PER_BAR_COGS = 39891.91 / 15848  # ≈ 2.517...
+# 3PL Description keywords that mark a sales-team / GTM sendout. Extend the
+# list as needed; it is compiled once into a single case-insensitive scan.
+SALES_TEAM_KEYWORDS = ["gtm", "sales team", "sales_team", "gtm campaign", "marketing"]
+SALES_TEAM_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(SALES_TEAM_KEYWORDS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+# Only these input columns are used; everything else is skipped at read time
+ORDERS_COLS = [
+    "Name",
+    "Paid at",
+    "Email",
+    "Source",
+    "Lineitem quantity",
+    "Lineitem price",
+    "Subtotal",
+    "Discount Amount",
+    "Shipping",
+    "Taxes",
+    "Total",
+]
+THREEPL_COLS = [
+    "Type",
+    "Store Order Number",
+    "Order Code",
+    "Actual Shipment Date",
+    "Total Price",
+    "Total Tax",
+    "Total Quantity",
+    "Custom Discount",
+    "Handling Fee",
+    "Total Shipping Cost",
+    "Packaging",
+]
+
+# Shopify financial columns -> Master Log columns (coerced to numeric)
+ORDER_FINANCIAL_COLS = {
+    "Subtotal": "subtotal",
+    "Discount Amount": "discount",
+    "Shipping": "shipping",
+    "Taxes": "tax",
+    "Total": "total",
+}
+
+# Master Log column order
+MASTER_LOG_COLS = [
+    # Order Details
+    "order_ID",
+    "order_date",
+    "email",
+    "box_or_bar_or_case",
+    "source",
+    "line_item_quantity",
+    "total_bars_sold",
+    "line_item_price",
+    # Order Financials
+    "subtotal",
+    "discount",
+    "shipping",
+    "tax",
+    "total",
+    # Costs
+    "bar_cogs",
+    "total_shipping_cost",
+    "exclude_from_bars_sold",
+]
 
 
 # ---- HELPER FUNCTIONS ----
 
-def classify_shopify_item(price):
+def categorize_master_log(df):
     """
-    For Shopify rows:
-    case = 250 < line item price < 500
-    box = 20 < line item price < 100
-    bar  = line item price < 6.5
-    otherwise None
+    Store the low-cardinality `box_or_bar_or_case` and `source` columns as
+    pandas Categoricals (in place) so comparisons run over integer codes.
     """
-    try:
-        p = float(price)
-    except (TypeError, ValueError):
-        return None
-    if 20 < p < 100:
-        return "box"
-    elif 250 < p < 500:
-        return "case"
-    elif p < 6.5:
-        return "bar"
-    else:
-        return None
-
-
-def classify_sample_item(total_price, qty):
-    """
-    For free sample 3PL rows:
-    box = total price / quantity > 20
-    bar = total price / quantity < 10
-    otherwise None
-    """
-    try:
-        total_price = float(total_price)
-        qty = float(qty)
-        if qty <= 0:
-            return None
-        unit = total_price / qty
-    except (TypeError, ValueError, ZeroDivisionError):
-        return None
-
-    if unit > 20:
-        return "box"
-    elif unit < 10:
-        return "bar"
-    else:
-        return None
-
-
-def compute_bars_sold(item_type, qty):
-    """
-    7 bars per box.
-    168 bars per case.
-    """
-    if pd.isna(qty):
-        return 0
-    if item_type == "box":
-        return qty * 7
-    elif item_type == "case":
-        return qty * 168
-    elif item_type == "bar":
-        return qty
-    else:
-        return 0
-
-
-def compute_bar_cogs(item_type, qty):
-    bars = compute_bars_sold(item_type, qty)
-    return bars * PER_BAR_COGS
-
-
-def compute_total_shipping(row):
-    """
-    Total shipping cost (3PL):
-    Handling Fee + Total Shipping Cost + Packaging
-
-    If ALL three are missing, return NaN (blank in CSV).
-    """
-    vals = []
-    for col in ["Handling Fee", "Total Shipping Cost", "Packaging"]:
-        v = pd.to_numeric(row.get(col, np.nan), errors="coerce")
-        vals.append(v)
+    df["box_or_bar_or_case"] = pd.Categorical(df["box_or_bar_or_case"], categories=ITEM_TYPES)
+    df["source"] = df["source"].astype("category")
+    return df
 
-    # If everything is NaN (no 3PL match), leave blank
-    if all(pd.isna(v) for v in vals):
-        return np.nan
-
-    # Otherwise, sum the non-NaN pieces
-    return sum(v for v in vals if pd.notna(v))
 
 # ---- Outputs only Order log without 3pl (used for testing) ----
 
@@ -141,9 +147,8 @@ def orders_log_from_csv(orders_file, output_path=None):
     line_item_quantity, total_bars_sold, line_item_price, subtotal, discount,
     shipping, tax, total, bar_cogs, total_shipping_cost).
     """
-    orders = pd.read_csv(orders_file)
-
-    shopify = orders.copy()
+    # Freshly read and local to this function, so no defensive copy is needed
+    shopify = read_orders_csv(orders_file, usecols=ORDERS_COLS)
 
     #below logic takes the shopify orders and classifies them into box/bar/case and computes bars sold
     shopify["line_item_quantity"] = pd.to_numeric(
@@ -153,17 +158,10 @@ def orders_log_from_csv(orders_file, output_path=None):
         shopify.get("Lineitem price"), errors="coerce"
     )
 
-    shopify["box_or_bar_or_case"] = shopify["line_item_price"].apply(classify_shopify_item)
-    shopify["total_bars_sold"] = shopify.apply(
-        lambda r: compute_bars_sold(r["box_or_bar_or_case"], r["line_item_quantity"]),
-        axis=1,
-    )
-    
-    
-    shopify["bar_cogs"] = shopify.apply(
-        lambda r: compute_bar_cogs(r["box_or_bar_or_case"], r["line_item_quantity"]),
-        axis=1,
-    )
+    codes = shopify_item_codes(shopify["line_item_price"])
+    shopify["box_or_bar_or_case"] = pd.Categorical.from_codes(codes, categories=ITEM_TYPES)
+    shopify["total_bars_sold"] = compute_bars_sold_from_codes(codes, shopify["line_item_quantity"])
+    shopify["bar_cogs"] = compute_bar_cogs_from_codes(codes, shopify["line_item_quantity"])
 
     # No 3PL merge here, so total_shipping_cost is blank (NaN)
     shopify_rows = pd.DataFrame(
@@ -187,6 +185,7 @@ def orders_log_from_csv(orders_file, output_path=None):
             "total_shipping_cost": np.nan,
         }
     )
+    categorize_master_log(shopify_rows)
 
     if output_path:
         out_path = Path(output_path)
@@ -203,7 +202,7 @@ def orders_log_from_csv(orders_file, output_path=None):
                 )
         else:
             # Default to CSV for .csv or unknown extensions
-            shopify_rows.to_csv(output_path, index=False)
+            write_csv(shopify_rows, output_path)
             print(f"Orders-only CSV log written to: {output_path}")
 
     return shopify_rows
@@ -218,35 +217,33 @@ def build_master_log(orders_path, threepl_path, output_path=None):
     Returns a pandas.DataFrame. If `output_path` is provided the CSV
     will also be written to that path (backwards-compatible).
     """
-    # Read inputs (accept either DataFrame or path)
+    # Read inputs (accept either DataFrame or path). Caller frames are only
+    # read (filtered/joined into new frames), so they are not copied.
     if isinstance(orders_path, pd.DataFrame):
-        orders = orders_path.copy()
+        orders = orders_path
     else:
-        orders = pd.read_csv(orders_path)
+        orders = read_orders_csv(orders_path, usecols=ORDERS_COLS)
 
     if isinstance(threepl_path, pd.DataFrame):
-        threepl = threepl_path.copy()
+        threepl = threepl_path
     else:
-        threepl = pd.read_excel(threepl_path)
+        threepl = read_threepl_excel(threepl_path, usecols=THREEPL_COLS)
 
     # Only care about shipment rows in 3PL sheet
-    shipments = threepl[threepl["Type"] == "Shipment Order"].copy()
+    shipments = threepl[threepl["Type"] == "Shipment Order"]
 
     # ---- ALL SHOPIFY ORDERS ----
-    shopify = orders.copy()
+    shopify = orders
 
     # 3PL rows that have a Store Order Number (normal orders)
-    threepl_orders = shipments[shipments["Store Order Number"].notna()].copy()
-
-    # Merge Shopify line items with matching 3PL shipment row (if any)
-    merged = shopify.merge(
-        threepl_orders[
-            ["Store Order Number", "Handling Fee", "Total Shipping Cost", "Packaging"]
-        ],
-        left_on="Name",
-        right_on="Store Order Number",
-        how="left",     # <-- key change: keep ALL Shopify orders
-    )
+    threepl_orders = shipments[shipments["Store Order Number"].notna()]
+
+    # Join Shopify line items with matching 3PL shipment row (if any) via an
+    # index lookup keyed on the 3PL order number (left join: keep ALL Shopify orders)
+    shipping_lookup = threepl_orders.set_index("Store Order Number")[
+        ["Handling Fee", "Total Shipping Cost", "Packaging"]
+    ]
+    merged = shopify.join(shipping_lookup, on="Name", how="left").reset_index(drop=True)
 
     # Clean / compute fields for normal orders
     merged["line_item_quantity"] = pd.to_numeric(
@@ -256,41 +253,28 @@ def build_master_log(orders_path, threepl_path, output_path=None):
         merged["Lineitem price"], errors="coerce"
     )
 
-    merged["box_or_bar_or_case"] = merged["line_item_price"].apply(classify_shopify_item)
-    merged["total_bars_sold"] = merged.apply(
-        lambda r: compute_bars_sold(r["box_or_bar_or_case"], r["line_item_quantity"]), axis=1
-    )
-    merged["bar_cogs"] = merged.apply(
-        lambda r: compute_bar_cogs(r["box_or_bar_or_case"], r["line_item_quantity"]), axis=1
-    )
-    merged["total_shipping_cost"] = merged.apply(compute_total_shipping, axis=1)
-
-    merged_rows = pd.DataFrame(
-        {
-            # Order Details
-            "order_ID": merged["Name"],  # Shopify "Name"
-            "order_date": merged["Paid at"],
-            "email": merged["Email"],
-            "box_or_bar_or_case": merged["box_or_bar_or_case"],
-            "source": merged["Source"],
-            "line_item_quantity": merged["line_item_quantity"],
-            "total_bars_sold": merged["total_bars_sold"],
-            "line_item_price": merged["line_item_price"],
-            # Order Financials
-            "subtotal": pd.to_numeric(merged["Subtotal"], errors="coerce"),
-            "discount": pd.to_numeric(merged["Discount Amount"], errors="coerce"),
-            "shipping": pd.to_numeric(merged["Shipping"], errors="coerce"),
-            "tax": pd.to_numeric(merged["Taxes"], errors="coerce"),
-            "total": pd.to_numeric(merged["Total"], errors="coerce"),
-            # Costs
-            "bar_cogs": merged["bar_cogs"],
-            "total_shipping_cost": merged["total_shipping_cost"],
-            "exclude_from_bars_sold": False,
+    codes = shopify_item_codes(merged["line_item_price"])
+    merged["box_or_bar_or_case"] = pd.Categorical.from_codes(codes, categories=ITEM_TYPES)
+    merged["total_bars_sold"] = compute_bars_sold_from_codes(codes, merged["line_item_quantity"])
+    merged["bar_cogs"] = compute_bar_cogs_from_codes(codes, merged["line_item_quantity"])
+    merged["total_shipping_cost"] = compute_total_shipping_vec(merged)
+
+    fin_cols = list(ORDER_FINANCIAL_COLS)
+    merged[fin_cols] = merged[fin_cols].apply(pd.to_numeric, errors="coerce")
+    merged_rows = merged.rename(
+        columns={
+            "Name": "order_ID",  # Shopify "Name"
+            "Paid at": "order_date",
+            "Email": "email",
+            "Source": "source",
+            **ORDER_FINANCIAL_COLS,
         }
     )
+    merged_rows["exclude_from_bars_sold"] = False
 
     # ---- FREE SAMPLE SHIPMENTS: 3PL rows with no Store Order Number ----
 
+    # Copied because derived columns are added to this slice below
     samples = shipments[shipments["Store Order Number"].isna()].copy()
 
     samples["line_item_quantity"] = pd.to_numeric(
@@ -302,48 +286,41 @@ def build_master_log(orders_path, threepl_path, output_path=None):
     )
     # Treat all free samples as boxes (7 bars per box)
     samples["box_or_bar_or_case"] = "box"
-    samples["total_bars_sold"] = samples.apply(
-        lambda r: compute_bars_sold(r["box_or_bar_or_case"], r["line_item_quantity"]), axis=1
-    )
-    samples["bar_cogs"] = samples.apply(
-        lambda r: compute_bar_cogs(r["box_or_bar_or_case"], r["line_item_quantity"]), axis=1
+    samples["total_bars_sold"] = (
+        samples["line_item_quantity"].fillna(0) * BARS_PER_UNIT[ITEM_TYPES.index("box")]
     )
-    samples["total_shipping_cost"] = samples.apply(compute_total_shipping, axis=1)
+    samples["bar_cogs"] = samples["total_bars_sold"] * PER_BAR_COGS
+    samples["total_shipping_cost"] = compute_total_shipping_vec(samples)
 
     # --- Detect sales-team / GTM shipments in 3PL samples ---
     # If the 3PL row has no Store Order Number and the Description mentions
     # GTM or Sales team keywords, mark it as a sales_team item so it won't
     # count toward sold inventory or financials.
     desc_col = next((c for c in samples.columns if "description" in c.lower()), None)
-    if desc_col:
-        desc_series = samples[desc_col].fillna("").astype(str).str.lower()
-        keywords = ["gtm", "sales team", "sales_team", "gtm campaign", "marketing"]
-        pattern = "|".join(re.escape(k) for k in keywords)
-        samples["_is_sales_team"] = desc_series.str.contains(pattern)
+    # An all-blank Description column is read as floats and can't match
+    if desc_col and not pd.api.types.is_numeric_dtype(samples[desc_col]):
+        samples["_is_sales_team"] = samples[desc_col].str.contains(SALES_TEAM_RE, na=False)
     else:
         samples["_is_sales_team"] = False
 
-    sample_rows = pd.DataFrame(
-        {
-            # For free samples, fill only what we can from 3PL
-            "order_ID": samples["Order Code"],  # no Shopify order number
-            "order_date": samples["Actual Shipment Date"],
-            "email": "FREE SAMPLES",
-            "box_or_bar_or_case": samples["box_or_bar_or_case"],
-            "source": "free_sample",
-            "line_item_quantity": samples["line_item_quantity"],
-            "total_bars_sold": samples["total_bars_sold"],
-            "line_item_price": samples["unit_price"],
-            "subtotal": np.nan,  # not provided in spec for free samples
-            "discount": pd.to_numeric(samples["Custom Discount"], errors="coerce"),
-            "shipping": np.nan,  # Shopify shipping blank; shipping captured in total_shipping_cost
-            "tax": pd.to_numeric(samples["Total Tax"], errors="coerce"),
-            "total": np.nan,
-            "bar_cogs": samples["bar_cogs"],
-            "total_shipping_cost": samples["total_shipping_cost"],
-            "exclude_from_bars_sold": False,
+    # For free samples, fill only what we can from 3PL
+    sample_fin_cols = ["Custom Discount", "Total Tax"]
+    samples[sample_fin_cols] = samples[sample_fin_cols].apply(pd.to_numeric, errors="coerce")
+    sample_rows = samples.rename(
+        columns={
+            "Order Code": "order_ID",  # no Shopify order number
+            "Actual Shipment Date": "order_date",
+            "unit_price": "line_item_price",
+            "Custom Discount": "discount",
+            "Total Tax": "tax",
         }
     )
+    sample_rows["email"] = "FREE SAMPLES"
+    sample_rows["source"] = "free_sample"
+    sample_rows["subtotal"] = np.nan  # not provided in spec for free samples
+    sample_rows["shipping"] = np.nan  # Shopify shipping blank; shipping captured in total_shipping_cost
+    sample_rows["total"] = np.nan
+    sample_rows["exclude_from_bars_sold"] = False
 
     # Post-process sales-team marked rows: override source/email and zero-out
     # financial/quantity fields (but keep total_shipping_cost).
@@ -371,13 +348,18 @@ def build_master_log(orders_path, threepl_path, output_path=None):
             if col in sample_rows.columns:
                 sample_rows.loc[sales_idx, col] = 0
 
-    # Drop helper column
-    if "_is_sales_team" in samples.columns:
-        samples = samples.drop(columns=["_is_sales_team"])
-
     # ---- FINAL MASTER LOG ----
 
-    master = pd.concat([merged_rows, sample_rows], ignore_index=True)
+    # Join the two parts column by column straight into the final frame, which
+    # also drops the `_is_sales_team` helper and any other 3PL/Shopify columns
+    master = pd.DataFrame(
+        {
+            c: pd.concat([merged_rows[c], sample_rows[c]], ignore_index=True)
+            for c in MASTER_LOG_COLS
+        },
+        copy=False,
+    )
+    categorize_master_log(master)
 
     if output_path:
         out_path = Path(output_path)
@@ -392,7 +374,7 @@ def build_master_log(orders_path, threepl_path, output_path=None):
                     "Writing Excel files requires 'openpyxl' (pip install openpyxl)."
                 )
         else:
-            master.to_csv(output_path, index=False)
+            write_csv(master, output_path)
             print(f"Master log CSV written to: {output_path}")
 
     return master
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+import hashlib
+import os
+from pathlib import Path
+import pandas as pd
+import numpy as np
+
+"""
+SkyeHelpers.py
+
+Purpose:
+ - Single home for the helpers shared by the master-log builders
+     (`MasterLogCreation.py` and `extra/OnlyCaptures3PL.py`).
+
+Key operations performed:
+ - Classify Shopify line items and 3PL free samples as `box`/`case`/`bar`
+     (vectorized over whole columns).
+ - Compute bars sold, per-bar COGS and 3PL total shipping cost.
+ - Read the Shopify orders CSV and 3PL workbook with the fastest available
+     engine, and write CSV output.
+
+Notes:
+ - `PER_BAR_COGS` is defined here and re-used by every builder.
+ - Reading uses `pyarrow` / `python-calamine` when installed and falls back
+     to pandas' default readers otherwise.
+ - Parsing is only cached when the `SKYE_CACHE_DIR` environment variable
+     names a folder: parsed inputs are then stored there as Parquet, keyed by
+     path, mtime and size, so re-running on the same files skips the
+     CSV/Excel parse. The entries hold the parsed Shopify export (customer
+     names, emails, addresses), so the cache is off by default. Caching is
+     skipped silently when pyarrow is missing or the frame can't be stored.
+ - Writing an entry for a file drops the entries left from its older
+     versions; entries for files that are moved or deleted stay until the
+     folder is cleared.
+"""
+
+# ---- CONSTANTS ----
+# Per-bar COGS from: 39,891.91 / 15,848
+PER_BAR_COGS = 39891.91 / 15848  # ≈ 2.517...
+
+# Where parsed input frames are cached (see `cached_read`); None (the
+# default, SKYE_CACHE_DIR unset or empty) turns the cache off
+_cache_env = os.environ.get("SKYE_CACHE_DIR", "").strip()
+CACHE_DIR = Path(_cache_env) if _cache_env else None
+
+# Format of the cached input frames, part of every `read_orders_csv` /
+# `read_threepl_excel` cache tag. Bump it whenever their parsing changes so
+# frames parsed by older code are not served for unchanged files.
+INPUT_CACHE_VERSION = 1
+
+# Item types a line item can be classified as (categorical order)
+ITEM_TYPES = ["box", "case", "bar"]
+
+# Bars / COGS per unit, indexed by `ITEM_TYPES` code. The trailing 0 entry
+# is what code -1 (unclassified) picks up.
+BARS_PER_UNIT = np.array([7.0, 168.0, 1.0, 0.0])
+COGS_PER_UNIT = BARS_PER_UNIT * PER_BAR_COGS
+
+
+# ---- CLASSIFICATION / COSTS ----
+
+def classify_shopify_item(price):
+    """
+    For Shopify rows:
+    case = 250 < line item price < 500
+    box = 20 < line item price < 100
+    bar  = line item price < 6.5
+    otherwise None
+    """
+    try:
+        p = float(price)
+    except (TypeError, ValueError):
+        return None
+    if 20 < p < 100:
+        return "box"
+    elif 250 < p < 500:
+        return "case"
+    elif p < 6.5:
+        return "bar"
+    else:
+        return None
+
+
+def shopify_item_codes(prices):
+    """
+    Classify Shopify line item prices into integer codes indexing
+    `ITEM_TYPES` (0 = box, 1 = case, 2 = bar, -1 = unclassified) in one pass
+    over the price array:
+    box = 20 < line item price < 100
+    case = 250 < line item price < 500
+    bar = line item price < 6.5
+    Non-numeric prices are unclassified.
+    """
+    p = np.asarray(pd.to_numeric(prices, errors="coerce"), dtype=float)
+    codes = np.full(p.shape, -1, dtype=np.int8)
+    codes[(p > 20) & (p < 100)] = 0
+    codes[(p > 250) & (p < 500)] = 1
+    codes[p < 6.5] = 2
+    return codes
+
+
+def classify_sample_items(unit_prices, qtys):
+    """
+    Classify free sample 3PL rows from their unit prices (total price /
+    quantity):
+    box = unit price > 20
+    bar = unit price < 10
+    otherwise None. Rows with a missing or non-positive quantity classify
+    as None.
+    """
+    has_qty = qtys > 0
+    return np.select(
+        [has_qty & (unit_prices > 20), has_qty & (unit_prices < 10)],
+        ["box", "bar"],
+        default=None,
+    )
+
+
+def compute_bars_sold(item_type, qty):
+    """
+    7 bars per box.
+    168 bars per case.
+    """
+    if pd.isna(qty):
+        return 0
+    if item_type == "box":
+        return qty * 7
+    elif item_type == "case":
+        return qty * 168
+    elif item_type == "bar":
+        return qty
+    else:
+        return 0
+
+
+def compute_bar_cogs(item_type, qty):
+    bars = compute_bars_sold(item_type, qty)
+    return bars * PER_BAR_COGS
+
+
+def compute_bars_sold_from_codes(codes, qtys):
+    """
+    Bars sold per row from `ITEM_TYPES` codes (see `shopify_item_codes`)
+    and quantities: 7 bars per box, 168 per case, 1 per bar
+    (`BARS_PER_UNIT`). Missing quantities and code -1 count as 0 bars.
+    """
+    q = pd.to_numeric(qtys, errors="coerce")
+    q = np.nan_to_num(np.asarray(q, dtype=float), nan=0.0)
+    return BARS_PER_UNIT[codes] * q
+
+
+def compute_bar_cogs_from_codes(codes, qtys):
+    """
+    COGS per row from `ITEM_TYPES` codes and quantities: the bars sold
+    (see `compute_bars_sold_from_codes`) times `PER_BAR_COGS`.
+    """
+    q = pd.to_numeric(qtys, errors="coerce")
+    q = np.nan_to_num(np.asarray(q, dtype=float), nan=0.0)
+    return COGS_PER_UNIT[codes] * q
+
+
+def compute_bars_sold_vec(item_types, qtys):
+    """
+    Bars sold per row from aligned item-type ('box'/'case'/'bar') and
+    quantity columns: 7 bars per box, 168 per case, 1 per bar. Missing
+    quantities and unknown item types count as 0 bars.
+    """
+    codes = pd.Categorical(item_types, categories=ITEM_TYPES).codes
+    return compute_bars_sold_from_codes(codes, qtys)
+
+
+def compute_total_shipping_vec(df):
+    """
+    Total 3PL shipping cost per row of a DataFrame of 3PL rows:
+    Handling Fee + Total Shipping Cost + Packaging, with missing pieces
+    skipped. Rows where all three are missing stay NaN (blank in CSV).
+    """
+    total = np.zeros(len(df))
+    seen = np.zeros(len(df), dtype=bool)
+    for col in ["Handling Fee", "Total Shipping Cost", "Packaging"]:
+        if col not in df.columns:
+            continue
+        v = np.asarray(pd.to_numeric(df[col], errors="coerce"), dtype=float)
+        has = ~np.isnan(v)
+        total += np.where(has, v, 0.0)
+        seen |= has
+    total[~seen] = np.nan
+    return pd.Series(total, index=df.index)
+
+
+# ---- READ / WRITE ----
+
+def cache_file(path, tag="", suffix=".parquet"):
+    """
+    Path in `CACHE_DIR` for data derived from `path`. The key covers the
+    file's absolute path, mtime and size plus `tag` (e.g. the columns read),
+    so editing or replacing the file invalidates it. None if caching is off
+    or `path` can't be stat'ed (e.g. a buffer).
+
+    Names are `<path>_<version>_<tag>` digests, so `prune_cache` can find the
+    entries of older versions of the same file.
+    """
+    if CACHE_DIR is None:
+        return None
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    parts = (os.path.abspath(path), f"{st.st_mtime_ns}|{st.st_size}", tag)
+    name = "_".join(hashlib.blake2b(p.encode(), digest_size=8).hexdigest() for p in parts)
+    return CACHE_DIR / f"{name}{suffix}"
+
+
+def prune_cache(cache_path):
+    """
+    Delete the cache entries for the same file as `cache_path` (see
+    `cache_file`) that belong to another mtime/size, i.e. an older version
+    of it. Entries for other tags of the current version are kept.
+    """
+    path_key, version, _ = cache_path.stem.split("_")
+    try:
+        for entry in cache_path.parent.glob(f"{path_key}_*"):
+            if entry.name.split("_")[1] != version:
+                entry.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def cached_read(path, reader, tag=""):
+    """
+    Return `reader()`, caching the frame as Parquet in `CACHE_DIR` (see
+    `cache_file`).
+    """
+    cache_path = cache_file(path, tag)
+    if cache_path is None:
+        # Caching is off or not a plain file path (e.g. a buffer)
+        return reader()
+
+    if cache_path.exists():
+        try:
+            return pd.read_parquet(cache_path)
+        except (ImportError, OSError, ValueError):
+            pass
+
+    df = reader()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(cache_path, compression="zstd")
+    except (ImportError, OSError, ValueError, TypeError):
+        # pyarrow missing, unwritable cache dir, or mixed-type columns
+        cache_path.unlink(missing_ok=True)
+    else:
+        prune_cache(cache_path)
+    return df
+
+
+def read_threepl_excel(threepl_path, usecols=None):
+    """
+    Read the 3PL (Calibrate) workbook. Prefers the Rust-backed `calamine`
+    engine (pip install python-calamine) and falls back to pandas' default
+    openpyxl reader when it is not available.
+
+    `usecols` may be a list of column names to keep; missing names are
+    ignored and any Description-like column is always kept. A callable
+    `usecols` is passed through to pandas unchanged (and not cached; other
+    reads go through `cached_read`).
+    """
+    if callable(usecols):
+        return _read_excel(threepl_path, usecols)
+    tag = f"threepl:v{INPUT_CACHE_VERSION}"
+    if usecols is not None:
+        tag += ":" + ",".join(sorted(usecols))
+    if usecols is not None:
+        wanted = set(usecols)
+        usecols = lambda c: c in wanted or "description" in str(c).lower()
+    return cached_read(threepl_path, lambda: _read_excel(threepl_path, usecols), tag)
+
+
+def _read_excel(path, usecols):
+    try:
+        return pd.read_excel(path, engine="calamine", usecols=usecols)
+    except (ImportError, ValueError):
+        return pd.read_excel(path, usecols=usecols)
+
+
+def read_orders_csv(orders_path, usecols=None):
+    """
+    Read the Shopify orders export. Uses pandas' multithreaded `pyarrow`
+    CSV engine when pyarrow is installed, else the default C parser.
+
+    `usecols` may be a list of column names to keep; names missing from
+    the export are ignored. Reads go through `cached_read`.
+    """
+    tag = f"orders:v{INPUT_CACHE_VERSION}"
+    if usecols is not None:
+        tag += ":" + ",".join(sorted(usecols))
+    return cached_read(orders_path, lambda: _read_csv(orders_path, usecols), tag)
+
+
+def _read_csv(path, usecols):
+    if usecols is not None:
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [c for c in header if c in usecols]
+    try:
+        return pd.read_csv(path, engine="pyarrow", usecols=usecols)
+    except ImportError:
+        return pd.read_csv(path, usecols=usecols)
+
+
+def write_csv(df, output_path):
+    """
+    Write `df` to CSV (no index) using pyarrow's multithreaded C++ writer when
+    pyarrow is installed, else `DataFrame.to_csv`. Columns pyarrow can't type
+    (e.g. mixed strings and datetimes) also fall back to pandas.
+
+    Boolean columns (e.g. `exclude_from_bars_sold`) are written as
+    `True`/`False` like `to_csv` does, not Arrow's `true`/`false`.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        df.to_csv(output_path, index=False)
+        return
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df.to_csv(output_path, index=False)
+        return
+    for i, field in enumerate(table.schema):
+        if pa.types.is_boolean(field.type):
+            # Missing values stay null (blank), as with to_csv
+            spelled = pc.if_else(table.column(i), "True", "False")
+            table = table.set_column(i, field.name, spelled)
+    pa_csv.write_csv(table, output_path)
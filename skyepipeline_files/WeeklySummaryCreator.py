@@ -2,6 +2,7 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from skyepipeline_files.SkyeHelpers import ITEM_TYPES, read_threepl_excel
 
 """
 WeeklySummaryCreator.py
@@ -29,18 +30,52 @@ Notes:
  - Excel output requires `openpyxl` when writing `.xlsx` files.
 """
 
-def get_float_input(prompt, decimals=2):
+# Master-log columns the summary does arithmetic on
+MASTER_NUMERIC_COLS = ["total", "tax", "shipping", "bar_cogs", "total_shipping_cost",
+                       "line_item_quantity", "total_bars_sold"]
+
+# 3PL cost columns summed for non-shipment rows (Handling, Receiving,
+# Freight, Storage, ...). Any that are present are used.
+THREEPL_EXTRA_COST_COLS = [
+    "Handling Fee",
+    "Total Shipping Cost",
+    "LTL Freight",
+    "Packaging",
+    "Label Fee",
+    "Receiving",
+    "Returns",
+    "Storage",
+]
+
+
+def read_master_log_csv(master_path):
+    """
+    Read a Master Log CSV with its numeric columns typed up front (and the
+    item type as a categorical). Uses pandas' multithreaded `pyarrow` CSV
+    engine when pyarrow is installed, else the default C parser.
+    """
+    dtype = {col: "float64" for col in MASTER_NUMERIC_COLS}
+    dtype["box_or_bar_or_case"] = "category"
+    try:
+        return pd.read_csv(master_path, engine="pyarrow", dtype=dtype)
+    except ImportError:
+        return pd.read_csv(master_path, dtype=dtype)
+
+# Currency symbols, thousands separators and whitespace dropped from typed numbers
+_NUMBER_STRIP = str.maketrans("", "", "$, \t")
+
+def get_float_input(prompt, decimals=2, input_fn=input):
     while True:
-        s = input(prompt).strip()
+        s = input_fn(prompt).translate(_NUMBER_STRIP)
         try:
             value = float(s)
             return round(value, decimals)
         except ValueError:
             print("Please enter a valid number (e.g. 123.45).")
 
-def get_int_input(prompt):
+def get_int_input(prompt, input_fn=input):
     while True:
-        s = input(prompt).strip()
+        s = input_fn(prompt).translate(_NUMBER_STRIP)
         try:
             value = int(float(s))
             return value
@@ -62,20 +97,26 @@ def build_weekly_summary(
     """
     # ---- LOAD DATA ----
     if isinstance(master, pd.DataFrame):
-        master_df = master.copy()
+        # Ensure key numeric columns are numeric (CSV reads are typed on load).
+        # Frames from the pipeline already are, so nothing is converted or
+        # copied; otherwise only the text columns are coerced, into a new frame
+        # (master_df is only read below).
+        to_coerce = [
+            col for col in MASTER_NUMERIC_COLS
+            if col in master.columns and not pd.api.types.is_numeric_dtype(master[col])
+        ]
+        master_df = master.assign(**{
+            col: pd.to_numeric(master[col], errors="coerce") for col in to_coerce
+        }) if to_coerce else master
     else:
-        master_df = pd.read_csv(master)
+        master_df = read_master_log_csv(master)
 
     if isinstance(threepl, pd.DataFrame):
-        threepl_df = threepl.copy()
+        # Only read below, so the caller's frame is not copied
+        threepl_df = threepl
     else:
-        threepl_df = pd.read_excel(threepl)
-
-    # Ensure key numeric columns are numeric
-    for col in ["total", "tax", "bar_cogs", "total_shipping_cost",
-                "line_item_quantity", "total_bars_sold"]:
-        if col in master_df.columns:
-            master_df[col] = pd.to_numeric(master_df[col], errors="coerce")
+        # Only the row type and cost columns are used below
+        threepl_df = read_threepl_excel(threepl, usecols=["Type"] + THREEPL_EXTRA_COST_COLS)
 
     # ---- ASK USER INPUTS ----
     if payment_processing_fee is None:
@@ -89,13 +130,14 @@ def build_weekly_summary(
             "Enter starting inventory (in bars, whole number): "
         )
 
-    # ---- GROSS REVENUE & TAXES ----
-    gross_revenue = (master_df["total"] - master_df["tax"] - master_df["shipping"]).sum(skipna=True)
-    shipping_collected = master_df["shipping"].sum(skipna=True)
-    taxes_collected = master_df["tax"].sum(skipna=True)
-
-    # ---- COGS ----
-    cogs_total = master_df["bar_cogs"].sum(skipna=True)
+    # ---- GROSS REVENUE, TAXES & COGS ----
+    # One float block for the money columns; all totals are NaN-skipping
+    # reductions over it. Rows missing any of total/tax/shipping are left
+    # out of gross revenue.
+    money = master_df[["total", "tax", "shipping", "bar_cogs"]].to_numpy(dtype=float)
+    total, tax, shipping, _ = money.T
+    gross_revenue = np.nansum(total - tax - shipping)
+    taxes_collected, shipping_collected, cogs_total = np.nansum(money[:, 1:], axis=0)
 
     # ---- SHIPPING COSTS ----
     # Sum per-order shipping from the master frame. Some sample rows used
@@ -104,31 +146,23 @@ def build_weekly_summary(
         if col in master_df.columns:
             shipping_costs_orders += master_df[col].sum(skipna=True)
 
-    shipments = threepl_df.copy()
-
     # ---- Extra 3PL rows (e.g., Handling, Receiving, Freight, Storage) ----
     # Sum any cost-like columns for rows where Type != 'Shipment Order'.
-    # These columns can include: Handling Fee, Total Shipping Cost, LTL Freight,
-    # Packaging, Label Fee, Receiving, Returns, Storage. If present, they will
-    # be summed per-row and added to the period 3PL extra costs.
-    extra_cols_candidates = [
-        "Handling Fee",
-        "Total Shipping Cost",
-        "LTL Freight",
-        "Packaging",
-        "Label Fee",
-        "Receiving",
-        "Returns",
-        "Storage",
-    ]
-    ship_cols = [c for c in extra_cols_candidates if c in shipments.columns]
+    # The `THREEPL_EXTRA_COST_COLS` that are present are summed per-row and
+    # added to the period 3PL extra costs.
+    ship_cols = [c for c in THREEPL_EXTRA_COST_COLS if c in threepl_df.columns]
     extra_shipping_sum = 0.0
-    if "Type" in shipments.columns and ship_cols:
-        other_mask = ~shipments["Type"].astype(str).str.lower().eq("shipment order")
+    if "Type" in threepl_df.columns and ship_cols:
+        other_mask = ~threepl_df["Type"].astype(str).str.lower().eq("shipment order")
         if other_mask.any():
-            extra_df = shipments.loc[other_mask, ship_cols].apply(pd.to_numeric, errors="coerce").fillna(0)
-            # Sum across the row then across rows
-            extra_shipping_sum = extra_df.sum(axis=1).sum()
+            # Cost columns of the extra rows; the 3PL reader usually types
+            # them already, so only text columns go through to_numeric
+            extra = threepl_df.loc[other_mask, ship_cols]
+            to_coerce = [c for c in ship_cols if not pd.api.types.is_numeric_dtype(extra[c])]
+            if to_coerce:
+                extra = extra.assign(**{c: pd.to_numeric(extra[c], errors="coerce") for c in to_coerce})
+            # One NaN-skipping reduction over the block (blanks count as 0)
+            extra_shipping_sum = float(np.nansum(extra.to_numpy(dtype=float)))
 
     shipping_costs_total = shipping_costs_orders + payment_processing_fee + extra_shipping_sum
 
@@ -137,29 +171,25 @@ def build_weekly_summary(
     gross_margin = gross_profit / (gross_revenue + shipping_collected) if gross_revenue != 0 else np.nan
 
     # ---- INVENTORY / SALES ----
-    # Exclude sales-team samples from boxes/bars sold counts
+    # Units sold per item type in one weighted count over the `ITEM_TYPES`
+    # codes (unclassified rows, code -1, and blank quantities are skipped).
+    # Sales-team samples are left out of the boxes/bars sold counts by the
+    # same mask, so the master frame is not filtered first.
+    codes = pd.Categorical(master_df["box_or_bar_or_case"], categories=ITEM_TYPES).codes
+    qty = np.nan_to_num(master_df["line_item_quantity"].to_numpy(dtype=float))
+    counted = codes >= 0
     if "source" in master_df.columns:
-        boxes_sold = master_df.loc[
-            (master_df["box_or_bar_or_case"] == "box") & (master_df["source"] != "sales_team"),
-            "line_item_quantity",
-        ].sum(skipna=True)
-
-        bars_sold = master_df.loc[
-            (master_df["box_or_bar_or_case"] == "bar") & (master_df["source"] != "sales_team"),
-            "line_item_quantity",
-        ].sum(skipna=True)
-        
-        cases_sold = master_df.loc[
-            (master_df["box_or_bar_or_case"] == "case") & (master_df["source"] != "sales_team"),
-            "line_item_quantity",
-        ].sum(skipna=True)
-    else:
-        boxes_sold = master_df.loc[master_df["box_or_bar_or_case"] == "box", "line_item_quantity"].sum(skipna=True)
-        bars_sold = master_df.loc[master_df["box_or_bar_or_case"] == "bar", "line_item_quantity"].sum(skipna=True)
-        cases_sold = master_df.loc[master_df["box_or_bar_or_case"] == "case", "line_item_quantity"].sum(skipna=True)
+        counted &= (master_df["source"] != "sales_team").to_numpy(dtype=bool)
+    boxes_sold, cases_sold, bars_sold = np.bincount(
+        codes[counted], weights=qty[counted], minlength=len(ITEM_TYPES)
+    )
     # Exclude GTM/sales sendouts from total inventory sold
     if "exclude_from_bars_sold" in master_df.columns:
-        total_inventory_sold = master_df.loc[master_df["exclude_from_bars_sold"] == False, "total_bars_sold"].sum(skipna=True)
+        # A plain bool flag (as the master log builder writes it) is used as
+        # is; other dtypes only count rows that are explicitly False
+        excluded = master_df["exclude_from_bars_sold"]
+        kept = ~excluded.to_numpy() if excluded.dtype == bool else (excluded == False).fillna(False).to_numpy(dtype=bool)
+        total_inventory_sold = np.nansum(master_df["total_bars_sold"].to_numpy(dtype=float)[kept])
     else:
         #sums the rows of the total bars that master log has calculated per row
         total_inventory_sold = master_df["total_bars_sold"].sum(skipna=True)
@@ -198,31 +228,34 @@ def build_weekly_summary(
             summary_df.to_csv(output_path, index=False)
 
     # ---- PRINT A NICE SUMMARY ----
-    print("\n===== CUMULATIVE WEEKLY FINANCIALS (OVERALL) =====")
-    print(f"Gross Revenue:           ${gross_revenue:,.2f}")
-    print(f"Shipping Collected:           ${shipping_collected:,.2f}")
-    print(f"Taxes Collected:         ${taxes_collected:,.2f}")
-    print(f"COGS (total):            ${cogs_total:,.2f}")
-    print(f"Shipping Costs (3PL): ${shipping_costs_orders:,.2f}")
-    print(f"3PL Extra Costs:         ${extra_shipping_sum:,.2f}")
-    print(f"Payment Processing Fee:  ${payment_processing_fee:,.2f}")
-    print(f"Total Shipping Costs:    ${shipping_costs_total:,.2f}")
-    print(f"Gross Profit:            ${gross_profit:,.2f}")
+    # Built up as one block and printed with a single write
     if not np.isnan(gross_margin):
-        print(f"Gross Margin:            {gross_margin*100:,.2f}%")
+        margin_line = f"Gross Margin:            {gross_margin*100:,.2f}%"
     else:
-        print("Gross Margin:            N/A (Gross Revenue is 0)")
-
-    print("\n===== INVENTORY / UNITS =====")
-    print(f"Starting Inventory (bars):        {starting_inventory:,}")
-    print(f"Cases Sold This Week:            {int(cases_sold)}")
-    print(f"Boxes Sold This Week:             {int(boxes_sold)}")
-    print(f"Bars Sold This Week (single bars):{int(bars_sold)}")
-    print(f"Total Inventory Sold (bars):      {int(total_inventory_sold)}")
-    print(f"Weekly Ending Inventory (bars):   {int(weekly_ending_inventory)}")
-
+        margin_line = "Gross Margin:            N/A (Gross Revenue is 0)"
+    lines = [
+        "\n===== CUMULATIVE WEEKLY FINANCIALS (OVERALL) =====",
+        f"Gross Revenue:           ${gross_revenue:,.2f}",
+        f"Shipping Collected:           ${shipping_collected:,.2f}",
+        f"Taxes Collected:         ${taxes_collected:,.2f}",
+        f"COGS (total):            ${cogs_total:,.2f}",
+        f"Shipping Costs (3PL): ${shipping_costs_orders:,.2f}",
+        f"3PL Extra Costs:         ${extra_shipping_sum:,.2f}",
+        f"Payment Processing Fee:  ${payment_processing_fee:,.2f}",
+        f"Total Shipping Costs:    ${shipping_costs_total:,.2f}",
+        f"Gross Profit:            ${gross_profit:,.2f}",
+        margin_line,
+        "\n===== INVENTORY / UNITS =====",
+        f"Starting Inventory (bars):        {starting_inventory:,}",
+        f"Cases Sold This Week:            {int(cases_sold)}",
+        f"Boxes Sold This Week:             {int(boxes_sold)}",
+        f"Bars Sold This Week (single bars):{int(bars_sold)}",
+        f"Total Inventory Sold (bars):      {int(total_inventory_sold)}",
+        f"Weekly Ending Inventory (bars):   {int(weekly_ending_inventory)}",
+    ]
     if output_path:
-        print(f"\nWeekly summary written to: {output_path}")
+        lines.append(f"\nWeekly summary written to: {output_path}")
+    print("\n".join(lines))
 
     return summary_df
 
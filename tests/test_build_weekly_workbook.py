@@ -0,0 +1,89 @@
+import sys
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+from openpyxl.utils import get_column_letter
+
+from skyepipeline_files.BuildWeeklyWorkbook import (
+    COUNT_FORMAT,
+    CURRENCY_FORMAT,
+    PERCENT_FORMAT,
+    SEPARATOR_THIN,
+    summary_table_rows,
+    write_report_workbook,
+)
+
+
+def _master():
+    return pd.DataFrame({
+        "order_id": ["#1001", " padded ", "=SUM(A1)", None],
+        "line_item_quantity": [1, 2, 3, 4],
+        "subtotal": [12.5, np.nan, 0.1 + 0.2, -3.0],
+        "exclude_from_bars_sold": [True, False, False, True],
+        "created_at": pd.to_datetime(["2025-11-17 08:30:00", None, "2025-11-18 00:00:00", "2025-11-23 23:59:59"]),
+    })
+
+
+def _summary_rows():
+    return summary_table_rows([
+        ["============== Cumulative Period Financials =====================", ""],
+        ["Revenue", 1234.5, None, CURRENCY_FORMAT],
+        ["- COGS", -400.25, None, CURRENCY_FORMAT],
+        [SEPARATOR_THIN, ""],
+        ["Gross Margin", 0.675, None, PERCENT_FORMAT],
+        ["Bars left at 3PL", 250, "Negative at 3PL: -1", COUNT_FORMAT],
+    ])
+
+
+def _cells(path):
+    """Per sheet: cell values and types, number formats and column widths, as read back by openpyxl."""
+    wb = openpyxl.load_workbook(path)
+    sheets = {}
+    for ws in wb.worksheets:
+        # Blank cells' type depends on the writer, so only filled cells keep one
+        rows = [[(cell.value, cell.data_type if cell.value is not None else None) for cell in row] for row in ws.iter_rows()]
+        formats = [[cell.number_format for cell in row] for row in ws.iter_rows(min_row=2)]
+        widths = [ws.column_dimensions[get_column_letter(i + 1)].width for i in range(ws.max_column)]
+        sheets[ws.title] = (rows, formats, widths)
+    return sheets
+
+
+def _approx(value):
+    # Writers may round the last digit of a float differently
+    value, data_type = value
+    return (pytest.approx(value, rel=1e-12) if isinstance(value, float) else value), data_type
+
+
+def _assert_same_cells(expected, actual):
+    assert list(expected) == list(actual)
+    for name, (rows, formats, widths) in expected.items():
+        other_rows, other_formats, other_widths = actual[name]
+        assert len(rows) == len(other_rows), name
+        for row, other_row in zip(rows, other_rows):
+            assert [_approx(v) for v in other_row] == row, name
+        if name == "Financial Summary":
+            # Value column number formats
+            assert [f[1] for f in other_formats] == [f[1] for f in formats]
+        # xlsxwriter stores widths with its own character-padding rounding
+        assert other_widths == pytest.approx(widths, abs=1), name
+
+
+@pytest.fixture
+def jetxl_cells(tmp_path):
+    pytest.importorskip("jetxl")
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "jetxl.xlsx"
+    assert write_report_workbook(path, _master(), _summary_rows()) == "jetxl"
+    return _cells(path)
+
+
+@pytest.mark.parametrize("hidden", [["jetxl"], ["jetxl", "xlsxwriter"]], ids=["xlsxwriter", "openpyxl"])
+def test_fallback_writes_the_same_cells_as_jetxl(jetxl_cells, tmp_path, monkeypatch, hidden):
+    for module in hidden:
+        monkeypatch.setitem(sys.modules, module, None)
+    path = tmp_path / "fallback.xlsx"
+    writer = write_report_workbook(path, _master(), _summary_rows())
+    assert not writer.startswith("jetxl")
+    _assert_same_cells(jetxl_cells, _cells(path))